@@ -8,15 +8,63 @@ This module provides functionality to create and manage file tree structures.
 
 import os
 import sys
-import fnmatch
+from itertools import repeat
 from utils import should_ignore_path, load_gitignore_patterns
 
+class _ChildDict(dict):
+    """
+    Children of a directory node, by name.
+    
+    Any change drops the owner's cached display order so sorted_children rebuilds it.
+    """
+    __slots__ = ('_owner',)
+
+    def __init__(self, owner, *args):
+        super().__init__(*args)
+        self._owner = owner
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._owner._sorted_children = None
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._owner._sorted_children = None
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def pop(self, *args):
+        self._owner._sorted_children = None
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        self._owner._sorted_children = None
+        return dict.popitem(self)
+
+    def clear(self):
+        self._owner._sorted_children = None
+        dict.clear(self)
+
+    def update(self, *args, **kwargs):
+        self._owner._sorted_children = None
+        dict.update(self, *args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        self._owner._sorted_children = None
+        return dict.setdefault(self, key, default)
+
 class Node:
     """
     Classes that represent nodes in a file tree
     
     Represents a file or directory, which, if a directory, can have child nodes.
     """
+    # 노드마다 __dict__를 만들지 않도록 속성을 고정 (메모리 절약, 속성 접근 가속)
+    __slots__ = ('name', 'is_dir', '_children', 'parent', '_selected_children', '_selected',
+                 'expanded', '_sorted_children', '_render_cache', '_path', 'full_path')
+
     def __init__(self, name, is_dir, parent=None):
         """
         Initialise Node Class
@@ -26,27 +74,116 @@ class Node:
             is_dir (bool): Whether it is a directory
             parent (Node, optional): Parent node
         """
-        self.name = name
+        self.name = sys.intern(name)  # 같은 이름(__init__.py 등)은 하나의 문자열 객체를 공유
         self.is_dir = is_dir
+        self._sorted_children = None  # 정렬된 자식 목록 캐시 (자식이 바뀌면 None)
         self.children = {} if is_dir else None
         self.parent = parent
-        self.selected = True  # 기본적으로 선택됨
+        self._selected_children = 0  # 선택된 직계 자식 수
+        self._selected = False
+        self.selected = True  # 기본적으로 선택됨 (부모의 선택된 자식 수에 반영)
         self.expanded = True  # 폴더는 기본적으로 확장됨
+        self._render_cache = None  # 트리 화면에 그린 행 문자열 캐시
+        self._path = None  # 전체 경로 캐시 (트리 생성 후 이름/부모는 바뀌지 않음)
+
+    @property
+    def children(self):
+        """
+        Child nodes by name.
+        
+        Assigning a dict stores a copy that clears the display-order cache
+        whenever it is changed.
+        
+        Returns:
+            dict: Child nodes keyed by name, or None for a file
+        """
+        return self._children
+
+    @children.setter
+    def children(self, children):
+        self._children = None if children is None else _ChildDict(self, children)
+        self._sorted_children = None
+
+    @property
+    def selected(self):
+        """
+        Whether the node is selected.
+        
+        Setting it keeps the parent's count of selected children up to date.
+        
+        Returns:
+            bool: The selection state
+        """
+        return self._selected
+
+    @selected.setter
+    def selected(self, value):
+        value = bool(value)
+        if value is not self._selected:
+            self._selected = value
+            if self.parent is not None:
+                self.parent._selected_children += 1 if value else -1
+
+    @property
+    def selected_children_count(self):
+        """
+        Returns the number of selected direct children without scanning them.
+        
+        Returns:
+            int: Number of selected direct children
+        """
+        return self._selected_children
 
     @property
     def path(self):
         """
         Returns the full path to the node.
         
+        The path is computed once and cached, so siblings share the work of
+        resolving their common ancestors.
+        
         Returns:
             str: the full path of the node
         """
-        if self.parent is None:
-            return self.name
-        parent_path = self.parent.path
-        if parent_path.endswith(os.sep):
-            return parent_path + self.name
-        return parent_path + os.sep + self.name
+        path = self._path
+        if path is None:
+            if self.parent is None:
+                path = self.name
+            else:
+                parent_path = self.parent.path
+                if parent_path.endswith(os.sep):
+                    path = parent_path + self.name
+                else:
+                    path = parent_path + os.sep + self.name
+            self._path = path
+        return path
+
+def sorted_children(node):
+    """
+    Returns the children of a directory node in display order.
+
+    Directories come first, then files, each sorted alphabetically (case-insensitive).
+    The order is cached on the node; adding, removing, replacing or reassigning
+    children clears the cache, and the next call sorts again.
+
+    Args:
+        node (Node): Directory node
+
+    Returns:
+        tuple: Child nodes in display order.
+    """
+    children = node.children
+    if not children:
+        return ()
+
+    # 캐시는 (자식 dict, 정렬 결과) 형태로 저장하여 다른 dict로 바뀐 경우도 확인
+    cache = node._sorted_children
+    if isinstance(cache, tuple) and cache[0] is children:
+        return cache[1]
+
+    ordered = tuple(sorted(children.values(), key=lambda child: (not child.is_dir, child.name.lower())))
+    node._sorted_children = (children, ordered)
+    return ordered
 
 def build_file_tree(root_path, ignore_patterns=None):
     """
@@ -71,6 +208,19 @@ def build_file_tree(root_path, ignore_patterns=None):
     else:
         ignore_patterns = ignore_patterns + gitignore_patterns
 
+    # 와일드카드가 없는 단순 이름 패턴(.git, __pycache__ 등)은 집합 조회로 빠르게 처리
+    # 부정 패턴(!)이 있으면 우선순위가 바뀌므로 빠른 경로를 사용하지 않음
+    has_negation = any(pattern.startswith('!') for pattern in ignore_patterns)
+    if has_negation:
+        literal_names = frozenset()
+        glob_patterns = ignore_patterns
+    else:
+        literal_names = frozenset(
+            pattern for pattern in ignore_patterns
+            if pattern and '*' not in pattern and '/' not in pattern
+        )
+        glob_patterns = [pattern for pattern in ignore_patterns if pattern not in literal_names]
+
     def should_ignore(path):
         """
         Checks if the given path matches a pattern that should be ignored.
@@ -81,7 +231,9 @@ def build_file_tree(root_path, ignore_patterns=None):
         Returns:
             bool: True if it should be ignored, False otherwise
         """
-        return should_ignore_path(path, ignore_patterns)
+        if os.path.basename(path) in literal_names:
+            return True
+        return should_ignore_path(path, glob_patterns)
 
     root_name = os.path.basename(root_path.rstrip(os.sep))
     if not root_name:  # 루트 디렉토리 경우
@@ -102,7 +254,7 @@ def build_file_tree(root_path, ignore_patterns=None):
         if not path_parts:
             return
 
-        part = path_parts[0]
+        part = sys.intern(path_parts[0])
         remaining = path_parts[1:]
 
         if should_ignore(os.path.join(full_path, part)):
@@ -133,7 +285,7 @@ def build_file_tree(root_path, ignore_patterns=None):
                 full_path = os.path.join(dirpath, filename)
                 if filename not in root_node.children and not should_ignore(full_path):
                     file_node = Node(filename, False, root_node)
-                    root_node.children[filename] = file_node
+                    root_node.children[file_node.name] = file_node
         else:
             # 디렉토리 추가
             path_parts = rel_path.split(os.sep)
@@ -152,7 +304,12 @@ def build_file_tree(root_path, ignore_patterns=None):
                     full_path = os.path.join(dirpath, filename)
                     if not should_ignore(full_path) and filename not in current.children:
                         file_node = Node(filename, False, current)
-                        current.children[filename] = file_node
+                        current.children[file_node.name] = file_node
+
+    # 트리를 다 만든 뒤 디렉토리마다 한 번씩 표시 순서를 정렬해 둠
+    for node in iter_subtree(root_node):
+        if node.is_dir:
+            sorted_children(node)
 
     return root_node
 
@@ -168,30 +325,27 @@ def flatten_tree(node, visible_only=True):
         list: a list of (node, level) tuples.
     """
     flat_nodes = []
+    append = flat_nodes.append
+
+    # 재귀 대신 명시적 스택으로 전위 순회
+    stack = [(node, 0)]
+    pop = stack.pop
+    push = stack.extend
+    while stack:
+        row = pop()
+        current = row[0]
+        # 루트 노드는 건너뛰되, 루트의 자식부터는 level 0으로 시작.
+        # 스택의 튜플을 그대로 결과 행으로 사용
+        if current.parent is not None:  # 루트 노드 건너뛰기
+            append(row)
+
+        if current.is_dir and current.children and (not visible_only or current.expanded):
+            # 루트의 직계 자식들은 level 0, 그 아래부터는 level+1
+            next_level = 0 if current.parent is None else row[1] + 1
+            # 먼저 디렉토리, 그 다음 파일, 알파벳 순 (스택이므로 역순으로 넣음).
+            # zip/repeat로 (child, level) 튜플을 C 레벨에서 생성
+            push(zip(reversed(sorted_children(current)), repeat(next_level)))
 
-    def _traverse(node, level=0):
-        """
-        Traverse the tree and generate a flattened list of nodes.
-        
-        Args:
-            node (Node): The current node
-            level (int, optional): Current level
-        """
-        # 루트 노드는 건너뛰되, 루트의 자식부터는 level 0으로 시작
-        if node.parent is not None:  # 루트 노드 건너뛰기
-            flat_nodes.append((node, level))
-
-        if node.is_dir and node.children and (not visible_only or node.expanded):
-            # 먼저 디렉토리, 그 다음 파일, 알파벳 순으로 정렬
-            items = sorted(node.children.items(),
-                          key=lambda x: (not x[1].is_dir, x[0].lower()))
-
-            for _, child in items:
-                # 루트의 직계 자식들은 level 0, 그 아래부터는 level+1
-                next_level = 0 if node.parent is None else level + 1
-                _traverse(child, next_level)
-
-    _traverse(node)
     return flat_nodes
 
 def count_selected_files(node):
@@ -205,13 +359,61 @@ def count_selected_files(node):
         int: Number of selected files
     """
     count = 0
-    if not node.is_dir and node.selected:
-        count = 1
-    elif node.is_dir and node.children:
-        for child in node.children.values():
-            count += count_selected_files(child)
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if not current.is_dir:
+            if current.selected:
+                count += 1
+        elif current.children:
+            stack.extend(current.children.values())
     return count
 
+def iter_subtree(node):
+    """
+    Iterate over a node and all of its descendants without recursion.
+    
+    Args:
+        node (Node): The node to start from.
+        
+    Yields:
+        Node: The node itself, followed by every descendant (unordered).
+    """
+    stack = [node]
+    pop = stack.pop
+    while stack:
+        current = pop()
+        yield current
+        if current.is_dir and current.children:
+            stack.extend(current.children.values())
+
+def set_subtree_selected(node, selected):
+    """
+    Set the selection state of a node and all of its descendants.
+    
+    Every node below `node` receives the same state, so the children counters
+    can be written directly instead of being adjusted one node at a time.
+    
+    Args:
+        node (Node): The node to start from.
+        selected (bool): The selection state to set.
+    """
+    selected = bool(selected)
+    node.selected = selected  # 부모의 선택된 자식 수는 setter로 갱신
+    stack = [node]
+    pop = stack.pop
+    while stack:
+        current = pop()
+        children = current.children
+        if children:
+            # 하위 노드는 모두 같은 상태가 되므로 setter를 거치지 않고 직접 기록
+            current._selected_children = len(children) if selected else 0
+            for child in children.values():
+                child._selected = selected
+            stack.extend(children.values())
+        elif children is not None:
+            current._selected_children = 0
+
 def collect_selected_content(node, root_path):
     """
     Gather the contents of the selected files.
@@ -224,33 +426,33 @@ def collect_selected_content(node, root_path):
         list: a list of (file path, content) tuples.
     """
     results = []
+    # 루트 디렉토리 이름 접두사는 한 번만 계산
+    root_prefix = os.path.basename(root_path) + os.sep
 
-    if not node.is_dir and node.selected:
-        file_path = node.path
-
-        # 수정: 루트 경로가 중복되지 않도록 보장
-        if node.parent and node.parent.parent is None:
-            # 노드가 루트 바로 아래에 있으면 파일 이름만 사용
-            full_path = os.path.join(root_path, node.name)
-        else:
-            # 중첩된 파일의 경우 적절한 상대 경로 구성
-            rel_path = file_path
-            if file_path.startswith(os.path.basename(root_path) + os.sep):
-                rel_path = file_path[len(os.path.basename(root_path) + os.sep):]
-            full_path = os.path.join(root_path, rel_path)
-
-        try:
-            with open(full_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            results.append((file_path, content))
-        except UnicodeDecodeError:
-            print(f"이진 파일 무시: {file_path}")
-        except Exception as e:
-            print(f"{full_path} 읽기 오류: {e}")
-    elif node.is_dir and node.children:
-        for child in node.children.values():
-            results.extend(collect_selected_content(child, root_path))
+    def _collect(node):
+        """
+        Recursively collects the contents of the selected files under the node.
 
+        Args:
+            node (Node): The current node
+        """
+        if not node.is_dir and node.selected:
+            file_path = node.path
+            full_path = _resolve_full_path(node, file_path, root_path, root_prefix)
+
+            try:
+                with open(full_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                results.append((file_path, content))
+            except UnicodeDecodeError:
+                print(f"이진 파일 무시: {file_path}")
+            except Exception as e:
+                print(f"{full_path} 읽기 오류: {e}")
+        elif node.is_dir and node.children:
+            for child in node.children.values():
+                _collect(child)
+
+    _collect(node)
     return results
 
 def collect_all_content(node, root_path):
@@ -265,29 +467,55 @@ def collect_all_content(node, root_path):
         list: a list of (file path, content) tuples.
     """
     results = []
+    # 루트 디렉토리 이름 접두사는 한 번만 계산
+    root_prefix = os.path.basename(root_path) + os.sep
 
-    if not node.is_dir:
-        file_path = node.path
-
-        # 수정: collect_selected_content와 동일한 경로 수정 적용
-        if node.parent and node.parent.parent is None:
-            full_path = os.path.join(root_path, node.name)
-        else:
-            rel_path = file_path
-            if file_path.startswith(os.path.basename(root_path) + os.sep):
-                rel_path = file_path[len(os.path.basename(root_path) + os.sep):]
-            full_path = os.path.join(root_path, rel_path)
-
-        try:
-            with open(full_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            results.append((file_path, content))
-        except UnicodeDecodeError:
-            pass  # 이진 파일 조용히 무시
-        except Exception:
-            pass  # 오류 조용히 무시
-    elif node.is_dir and node.children:
-        for child in node.children.values():
-            results.extend(collect_all_content(child, root_path))
+    def _collect(node):
+        """
+        Recursively collects the contents of all files under the node.
 
+        Args:
+            node (Node): The current node
+        """
+        if not node.is_dir:
+            file_path = node.path
+            full_path = _resolve_full_path(node, file_path, root_path, root_prefix)
+
+            try:
+                with open(full_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                results.append((file_path, content))
+            except UnicodeDecodeError:
+                pass  # 이진 파일 조용히 무시
+            except Exception:
+                pass  # 오류 조용히 무시
+        elif node.is_dir and node.children:
+            for child in node.children.values():
+                _collect(child)
+
+    _collect(node)
     return results
+
+def _resolve_full_path(node, file_path, root_path, root_prefix):
+    """
+    Resolves the on-disk path of a file node.
+    
+    Args:
+        node (Node): File node
+        file_path (str): Tree path of the node (node.path)
+        root_path (str): Root directory path
+        root_prefix (str): Root directory name followed by a path separator
+        
+    Returns:
+        str: the full path of the file on disk.
+    """
+    # 수정: 루트 경로가 중복되지 않도록 보장
+    if node.parent and node.parent.parent is None:
+        # 노드가 루트 바로 아래에 있으면 파일 이름만 사용
+        return os.path.join(root_path, node.name)
+
+    # 중첩된 파일의 경우 적절한 상대 경로 구성
+    rel_path = file_path
+    if file_path.startswith(root_prefix):
+        rel_path = file_path[len(root_prefix):]
+    return os.path.join(root_path, rel_path)
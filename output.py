@@ -11,6 +11,28 @@ It supports the following output formats
 """
 
 import os
+from filetree import sorted_children
+from utils import get_language_name
+
+def get_file_extension(path):
+    """
+    파일 경로에서 점을 제외한 소문자 확장자를 반환합니다.
+
+    Args:
+        path: 파일 경로
+
+    Returns:
+        str: 확장자 (예: 'py'), 확장자가 없으면 빈 문자열
+    ---
+    Returns the lowercase extension of a file path without the dot.
+
+    Args:
+        path: File path
+
+    Returns:
+        str: Extension (e.g. 'py'), or an empty string if there is none
+    """
+    return os.path.splitext(path)[1][1:].lower()
 
 def write_file_tree_to_string(node, prefix='', is_last=True):
     """
@@ -41,10 +63,9 @@ def write_file_tree_to_string(node, prefix='', is_last=True):
         result += f"{prefix}{branch}{node.name}\n"
 
     if node.is_dir and node.children:
-        items = sorted(node.children.items(),
-                      key=lambda x: (not x[1].is_dir, x[0].lower()))
+        items = sorted_children(node)
 
-        for i, (_, child) in enumerate(items):
+        for i, child in enumerate(items):
             is_last_child = i == len(items) - 1
             new_prefix = prefix + ('    ' if is_last else '│   ')
             result += write_file_tree_to_string(child, new_prefix, is_last_child)
@@ -103,7 +124,7 @@ def write_output_file(output_path, root_path, root_node, file_contents, output_f
                 f.write("```")
 
                 # 확장자를 통한 구문 강조 결정
-                ext = os.path.splitext(path)[1][1:].lower()
+                ext = get_file_extension(path)
                 if ext:
                     f.write(ext)
 
@@ -153,50 +174,88 @@ def write_markdown_output(output_path, root_path, root_node, file_contents):
             f.write(f"### {path}\n\n")
 
             # 확장자 기반 구문 강조 추가
-            ext = os.path.splitext(path)[1][1:].lower()
+            ext = get_file_extension(path)
             f.write(f"```{ext}\n")
             f.write(content)
             if not content.endswith('\n'):
                 f.write('\n')
             f.write("```\n\n")
 
-def get_language_name(extension):
+def classify_dependencies(dependencies):
     """
-    파일 확장자를 언어 이름으로 변환합니다.
-    
+    각 파일의 의존성을 내부(프로젝트 파일)와 외부로 분류합니다.
+
     Args:
-        extension: 파일 확장자
-        
+        dependencies: 파일 간 의존성 정보 {파일: {의존성, ...}, ...}
+
     Returns:
-        str: 해당 확장자의 프로그래밍 언어 이름
+        dict: {파일: (정렬된 내부 의존성 목록, 정렬된 외부 의존성 목록)}
+    ---
+    Splits each file's dependencies into internal (project files) and external ones.
+
+    Args:
+        dependencies: Dependency information between files {file: {dependency, ...}, ...}
+
+    Returns:
+        dict: {file: (sorted internal dependencies, sorted external dependencies)}
     """
-    language_map = {
-        'py': 'Python',
-        'c': 'C',
-        'cpp': 'C++',
-        'h': 'C/C++ Header',
-        'hpp': 'C++ Header',
-        'js': 'JavaScript',
-        'ts': 'TypeScript',
-        'java': 'Java',
-        'html': 'HTML',
-        'css': 'CSS',
-        'php': 'PHP',
-        'rb': 'Ruby',
-        'go': 'Go',
-        'rs': 'Rust',
-        'swift': 'Swift',
-        'kt': 'Kotlin',
-        'sh': 'Shell',
-        'md': 'Markdown',
-        'json': 'JSON',
-        'xml': 'XML',
-        'yaml': 'YAML',
-        'yml': 'YAML',
-        'sql': 'SQL',
-        'r': 'R',
+    classified = {}
+    for file, deps in dependencies.items():
+        internal_deps = []
+        external_deps = []
+        for dep in deps:
+            if isinstance(dep, str) and os.path.sep in dep:  # 파일 경로인 경우
+                internal_deps.append(dep)
+            else:
+                external_deps.append(dep)
+        classified[file] = (sorted(internal_deps), sorted(external_deps))
+    return classified
+
+def collect_tree_stats(root_node):
+    """
+    파일 트리를 한 번만 순회하여 출력에 필요한 통계를 수집합니다.
+
+    Args:
+        root_node: 파일 트리 루트 노드
+
+    Returns:
+        dict: {'total_files': 펼쳐진 디렉토리 아래의 파일 수,
+               'selected_files': 선택된 파일 수,
+               'main_dirs': 루트 바로 아래 디렉토리 노드 목록}
+    ---
+    Collects the statistics needed for output in a single pass over the file tree.
+
+    Args:
+        root_node: File tree root node
+
+    Returns:
+        dict: {'total_files': number of files under expanded directories,
+               'selected_files': number of selected files,
+               'main_dirs': directory nodes directly under the root}
+    """
+    total_files = 0
+    selected_files = 0
+
+    # (노드, 보이는지 여부) 스택으로 반복 순회
+    stack = [(root_node, True)]
+    while stack:
+        node, visible = stack.pop()
+        if not node.is_dir:
+            if visible:
+                total_files += 1
+            if node.selected:
+                selected_files += 1
+        elif node.children:
+            children_visible = visible and node.expanded
+            stack.extend((child, children_visible) for child in node.children.values())
+
+    main_dirs = [child for child in sorted_children(root_node) if child.is_dir]
+
+    return {
+        'total_files': total_files,
+        'selected_files': selected_files,
+        'main_dirs': main_dirs,
     }
-    return language_map.get(extension, extension.upper())
 
 def write_llm_optimized_output(output_path, root_path, root_node, file_contents, dependencies):
     """
@@ -218,57 +277,32 @@ def write_llm_optimized_output(output_path, root_path, root_node, file_contents,
         file_contents: List of file contents [(path, contents), ...].
         dependencies: Dependency information between files
     """
-    # count_selected_files 함수를 모듈에서 임포트하지 않았기 때문에 필요한 함수를 정의
-    def count_selected_files(node):
-        """Counts the number of selected files (excluding directories)."""
-        count = 0
-        if not node.is_dir and node.selected:
-            count = 1
-        elif node.is_dir and node.children:
-            for child in node.children.values():
-                count += count_selected_files(child)
-        return count
-    
-    # flatten_tree 함수를 모듈에서 임포트하지 않았기 때문에 필요한 함수를 정의
-    def flatten_tree(node, visible_only=True):
-        """Flattens the tree into a list of nodes for navigation."""
-        flat_nodes = []
-
-        def _traverse(node, level=0):
-            if node.parent is not None:  # 루트 노드 제외
-                flat_nodes.append((node, level))
-
-            if node.is_dir and node.children and (not visible_only or node.expanded):
-                # 디렉토리 먼저, 그다음 파일, 알파벳 순으로 정렬
-                items = sorted(node.children.items(),
-                              key=lambda x: (not x[1].is_dir, x[0].lower()))
-
-                for _, child in items:
-                    _traverse(child, level + 1)
-
-        _traverse(node)
-        return flat_nodes
-
     with open(output_path, 'w', encoding='utf-8') as f:
         # 헤더 및 개요
         f.write("# PROJECT ANALYSIS FOR AI ASSISTANT\n\n")
 
-        # 프로젝트 일반 정보
-        total_files = sum(1 for node, _ in flatten_tree(root_node) if not node.is_dir)
-        selected_files = count_selected_files(root_node)
+        # 프로젝트 일반 정보 (트리는 한 번만 순회)
+        tree_stats = collect_tree_stats(root_node)
         f.write("## 📦 GENERAL INFORMATION\n\n")
         f.write(f"- **Project path**: `{root_path}`\n")
-        f.write(f"- **Total files**: {total_files}\n")
-        f.write(f"- **Files included in this analysis**: {selected_files}\n")
+        f.write(f"- **Total files**: {tree_stats['total_files']}\n")
+        f.write(f"- **Files included in this analysis**: {tree_stats['selected_files']}\n")
 
-        # 사용된 언어 감지
+        # 사용된 언어 감지 (최상위 디렉토리별 통계도 같은 순회에서 수집)
         languages = {}
+        dir_stats = {}  # {최상위 경로 요소: [파일 수, {확장자: 개수}]}
         for path, _ in file_contents:
-            ext = os.path.splitext(path)[1].lower()
+            ext = get_file_extension(path)
             if ext:
-                ext = ext[1:]  # 점 제거
                 languages[ext] = languages.get(ext, 0) + 1
 
+            top_dir, sep, _ = path.partition("/")
+            if sep:
+                stats = dir_stats.setdefault(top_dir, [0, {}])
+                stats[0] += 1
+                if ext:
+                    stats[1][ext] = stats[1].get(ext, 0) + 1
+
         if languages:
             f.write("- **Main languages used**:\n")
             for ext, count in sorted(languages.items(), key=lambda x: x[1], reverse=True)[:5]:
@@ -284,25 +318,17 @@ def write_llm_optimized_output(output_path, root_path, root_node, file_contents,
         f.write("```\n\n")
 
         # 주요 디렉토리 및 컴포넌트
-        main_dirs = [node for node, level in flatten_tree(root_node, False)
-                    if node.is_dir and level == 1]
+        main_dirs = tree_stats['main_dirs']
 
         if main_dirs:
             f.write("### 📂 Main Components\n\n")
             for dir_node in main_dirs:
-                dir_files = [p for p, _ in file_contents if p.startswith(f"{dir_node.name}/")]
                 f.write(f"- **`{dir_node.name}/`** - ")
-                if dir_files:
-                    f.write(f"Contains {len(dir_files)} files")
+                if dir_node.name in dir_stats:
+                    dir_file_count, dir_exts = dir_stats[dir_node.name]
+                    f.write(f"Contains {dir_file_count} files")
 
                     # 이 디렉토리의 언어들
-                    dir_exts = {}
-                    for path in dir_files:
-                        ext = os.path.splitext(path)[1].lower()
-                        if ext:
-                            ext = ext[1:]
-                            dir_exts[ext] = dir_exts.get(ext, 0) + 1
-
                     if dir_exts:
                         main_langs = [get_language_name(ext) for ext, _ in
                                      sorted(dir_exts.items(), key=lambda x: x[1], reverse=True)[:2]]
@@ -314,14 +340,14 @@ def write_llm_optimized_output(output_path, root_path, root_node, file_contents,
         # 파일 관계 그래프
         f.write("## 🔄 FILE RELATIONSHIPS\n\n")
 
+        # 파일별 의존성을 내부/외부로 한 번만 분류
+        classified_deps = classify_dependencies(dependencies)
+
         # 가장 많이 참조된 파일 찾기
         referenced_by = {}
-        for file, deps in dependencies.items():
-            for dep in deps:
-                if isinstance(dep, str) and os.path.sep in dep:  # 파일 경로인 경우
-                    if dep not in referenced_by:
-                        referenced_by[dep] = []
-                    referenced_by[dep].append(file)
+        for file, (internal_deps, _) in classified_deps.items():
+            for dep in internal_deps:
+                referenced_by.setdefault(dep, []).append(file)
 
         # 중요한 관계 표시
         if referenced_by:
@@ -333,23 +359,20 @@ def write_llm_optimized_output(output_path, root_path, root_node, file_contents,
 
         # 파일별 의존성 표시
         f.write("### Dependencies by File\n\n")
-        for file, deps in sorted(dependencies.items()):
-            if deps:
-                internal_deps = [d for d in deps if isinstance(d, str) and os.path.sep in d]
-                external_deps = [d for d in deps if d not in internal_deps]
-
+        for file, (internal_deps, external_deps) in sorted(classified_deps.items()):
+            if internal_deps or external_deps:
                 f.write(f"- **`{file}`**:\n")
 
                 if internal_deps:
                     f.write(f"  - *Internal dependencies*: ")
-                    f.write(", ".join(f"`{d}`" for d in sorted(internal_deps)[:5]))
+                    f.write(", ".join(f"`{d}`" for d in internal_deps[:5]))
                     if len(internal_deps) > 5:
                         f.write(f" and {len(internal_deps)-5} more")
                     f.write("\n")
 
                 if external_deps:
                     f.write(f"  - *External dependencies*: ")
-                    f.write(", ".join(f"`{d}`" for d in sorted(external_deps)[:5]))
+                    f.write(", ".join(f"`{d}`" for d in external_deps[:5]))
                     if len(external_deps) > 5:
                         f.write(f" and {len(external_deps)-5} more")
                     f.write("\n")
@@ -363,22 +386,21 @@ def write_llm_optimized_output(output_path, root_path, root_node, file_contents,
             f.write(f"### {path}\n\n")
 
             # 파일 정보 추가 (가능한 경우)
-            file_deps = dependencies.get(path, set())
+            file_deps = classified_deps.get(path)
             if file_deps:
-                internal_deps = [d for d in file_deps if isinstance(d, str) and os.path.sep in d]
-                external_deps = [d for d in file_deps if d not in internal_deps]
+                internal_deps, external_deps = file_deps
 
                 if internal_deps or external_deps:
                     f.write("**Dependencies:**\n")
 
                     if internal_deps:
-                        f.write("- Internal: " + ", ".join(f"`{d}`" for d in sorted(internal_deps)[:3]))
+                        f.write("- Internal: " + ", ".join(f"`{d}`" for d in internal_deps[:3]))
                         if len(internal_deps) > 3:
                             f.write(f" and {len(internal_deps)-3} more")
                         f.write("\n")
 
                     if external_deps:
-                        f.write("- External: " + ", ".join(f"`{d}`" for d in sorted(external_deps)[:3]))
+                        f.write("- External: " + ", ".join(f"`{d}`" for d in external_deps[:3]))
                         if len(external_deps) > 3:
                             f.write(f" and {len(external_deps)-3} more")
                         f.write("\n")
@@ -386,7 +408,7 @@ def write_llm_optimized_output(output_path, root_path, root_node, file_contents,
                     f.write("\n")
 
             # 확장자 기반 구문 강조
-            ext = os.path.splitext(path)[1][1:].lower()
+            ext = get_file_extension(path)
             f.write(f"```{ext}\n")
             f.write(content)
             if not content.endswith('\n'):
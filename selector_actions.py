@@ -7,7 +7,288 @@ A module that provides file selection, expansion, and search functionality.
 """
 
 import re
-from filetree import flatten_tree
+import functools
+from filetree import flatten_tree, iter_subtree, set_subtree_selected
+
+@functools.lru_cache(maxsize=128)
+def compile_search_pattern(query, flags):
+    """
+    Compiles a search query into a regular expression, caching the result.
+    
+    Args:
+        query (str): The search query
+        flags (int): Regular expression flags
+        
+    Returns:
+        re.Pattern: The compiled pattern
+        
+    Raises:
+        re.error: If the query is not a valid regular expression
+    """
+    return re.compile(query, flags)
+
+# 정규식 메타문자가 하나도 없는 검색어는 단순 부분 문자열 검색으로 처리
+_REGEX_METACHARACTERS = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
+# 하나의 대체 패턴으로 합치면 의미가 달라지는 구문 (역참조, 조건부 그룹 참조, 인라인 플래그)
+_UNCOMBINABLE_QUERY = re.compile(r'\\[1-9]|\(\?P=|\(\?\(|\(\?[aiLmsux]')
+
+def is_literal_query(query):
+    """
+    Checks whether a search query contains no regular expression metacharacters.
+    
+    Args:
+        query (str): The search query
+        
+    Returns:
+        bool: True if the query can be matched as a plain substring
+    """
+    return _REGEX_METACHARACTERS.search(query) is None
+
+def is_query_refinement(queries, previous_queries, case_sensitive):
+    """
+    Checks whether every name matching the queries also matches the previous queries.
+    
+    This holds when all queries are plain substrings and each new query contains
+    one of the previous ones (e.g. "core" after "co"), so the previous result
+    can be searched instead of the whole tree.
+    
+    Args:
+        queries (tuple[str]): The new search queries
+        previous_queries (tuple[str]): The search queries of an earlier result
+        case_sensitive (bool): Whether both searches are case sensitive
+        
+    Returns:
+        bool: True if the new result is a subset of the previous one
+    """
+    if not queries or not previous_queries:
+        return False
+    if not all(is_literal_query(query) for query in queries + previous_queries):
+        return False
+    if not case_sensitive:
+        # lower()로 포함 관계를 비교할 수 있는 것은 ASCII 검색어뿐
+        if not all(query.isascii() for query in queries + previous_queries):
+            return False
+        queries = tuple(query.lower() for query in queries)
+        previous_queries = tuple(query.lower() for query in previous_queries)
+    return all(any(previous in query for previous in previous_queries) for query in queries)
+
+def _build_literal_matcher(needles, case_sensitive):
+    """
+    Builds a predicate that matches names containing any of the plain substrings.
+    
+    Args:
+        needles (tuple[str]): Non-empty plain substring queries
+        case_sensitive (bool): Whether the search is case sensitive
+        
+    Returns:
+        callable: A function taking a name and returning a truthy value if it matches
+    """
+    if case_sensitive:
+        # 검색어가 하나뿐인 흔한 경우는 반복문 없이 바로 `in` 검사
+        if len(needles) == 1:
+            needle = needles[0]
+
+            def matches(name):
+                return needle in name
+            return matches
+
+        # any()와 제너레이터 대신 반복문을 사용해 파일 이름마다 생성되는 프레임을 줄임
+        def matches(name):
+            for needle in needles:
+                if needle in name:
+                    return True
+            return False
+        return matches
+
+    # 대소문자 무시 규칙은 ASCII 범위에서만 lower()와 같으므로(ſ, K 등) 그 밖에서는 정규식으로 검사
+    regex_matches = _build_regex_matcher(needles, re.IGNORECASE)
+    if not all(needle.isascii() for needle in needles):
+        return regex_matches
+    needles = tuple(needle.lower() for needle in needles)
+
+    if len(needles) == 1:
+        needle = needles[0]
+
+        def matches(name):
+            if name.isascii():
+                return needle in name.lower()
+            return regex_matches(name)
+        return matches
+
+    def matches(name):
+        if not name.isascii():
+            return regex_matches(name)
+        name = name.lower()
+        for needle in needles:
+            if needle in name:
+                return True
+        return False
+    return matches
+
+# {m}, {m,}, {,n}, {m,n} 형태일 때만 반복 횟수이고, 그 밖의 {는 일반 문자
+_REPEAT_BRACES = re.compile(r'\{\d*(?:,\d*)?\}')
+
+def _required_literals(query):
+    """
+    Finds plain substrings that every match of a regular expression must contain.
+    
+    The scan is conservative: anything inside groups or character classes, characters
+    made optional or repeated by a quantifier, and patterns using alternation or
+    inline flags contribute nothing.
+    
+    Args:
+        query (str): A regular expression query
+        
+    Returns:
+        list: Substrings that are present in every string the query matches
+    """
+    # 대체(|)나 인라인 플래그가 있으면 필수 문자열을 알 수 없음
+    if '|' in query or '(?' in query:
+        return []
+
+    literals = []
+    run = []
+    depth = 0  # 그룹 안의 문자는 그룹 전체가 선택적일 수 있으므로 무시
+    index = 0
+    length = len(query)
+    while index < length:
+        char = query[index]
+        index += 1
+        if char == '\\':
+            escaped = query[index:index + 1]
+            index += 1
+            if escaped and not escaped.isalnum():
+                # \. \$ 등 이스케이프된 메타문자는 그 문자 자체
+                if depth == 0:
+                    run.append(escaped)
+                continue
+            if escaped in ('x', 'u', 'U', 'N') or escaped.isdigit():
+                return []  # 코드 값 이스케이프(\x41 등)와 역참조(\1 등)는 분석하지 않음
+            char = None  # \d \w \b 등은 문자열이 아님
+        elif char == '[':
+            # 문자 클래스는 건너뜀 (맨 앞의 ^와 ]는 클래스의 일부)
+            if query[index:index + 1] == '^':
+                index += 1
+            if query[index:index + 1] == ']':
+                index += 1
+            while index < length and query[index] != ']':
+                index += 2 if query[index] == '\\' else 1
+            index += 1
+            char = None
+        elif char == '(':
+            depth += 1
+            char = None
+        elif char == ')':
+            depth -= 1
+            char = None
+        elif char in '*?+' or (char == '{' and _REPEAT_BRACES.match(query, index - 1)):
+            # 바로 앞 글자는 없거나 반복될 수 있으므로 필수 문자열에서 제외
+            if run:
+                run.pop()
+            if char == '{':
+                index = _REPEAT_BRACES.match(query, index - 1).end()
+            char = None
+        elif char in '.^$':
+            char = None
+
+        if char is None:
+            if run:
+                literals.append(''.join(run))
+                run = []
+        elif depth == 0:
+            run.append(char)
+
+    if run:
+        literals.append(''.join(run))
+    return literals
+
+def _build_regex_matcher(queries, flags):
+    """
+    Builds a predicate that matches names against any of the regular expressions.
+    
+    Args:
+        queries (tuple[str]): Non-empty regular expression queries
+        flags (int): Regular expression flags
+        
+    Returns:
+        callable: A function taking a name and returning a match object if it matches
+        
+    Raises:
+        re.error: If a query is not a valid regular expression
+    """
+    # 각 검색어를 먼저 개별 컴파일해 잘못된 정규식이면 re.error를 그대로 전달
+    compiled_patterns = [compile_search_pattern(query, flags) for query in queries]
+    if len(compiled_patterns) == 1:
+        search = compiled_patterns[0].search
+        literal = max(_required_literals(queries[0]), key=len, default="")
+        ignore_case = flags & re.IGNORECASE
+        # 대소문자 무시 규칙은 ASCII 범위에서만 lower()와 같으므로(İ, K 등) 그 밖에서는 사전 검사 안 함
+        if not literal or (ignore_case and not literal.isascii()):
+            return search
+
+        # 정규식이 반드시 포함하는 문자열이 없는 이름은 정규식 엔진을 거치지 않고 제외
+        if ignore_case:
+            literal = literal.lower()
+
+            def matches(name):
+                if name.isascii() and literal not in name.lower():
+                    return None
+                return search(name)
+        else:
+            def matches(name):
+                if literal not in name:
+                    return None
+                return search(name)
+        return matches
+
+    # 여러 검색어는 하나의 대체(|) 패턴으로 합쳐 파일 이름마다 한 번만 검색.
+    # 역참조와 조건부 그룹 참조는 그룹 번호가 바뀌고 인라인 플래그는 합칠 수 없으므로 개별 검색으로 처리
+    if not any(_UNCOMBINABLE_QUERY.search(query) for query in queries):
+        try:
+            return compile_search_pattern("|".join(f"(?:{query})" for query in queries), flags).search
+        except re.error:
+            pass
+
+    def matches(name):
+        return any(pattern.search(name) for pattern in compiled_patterns)
+    return matches
+
+@functools.lru_cache(maxsize=64)
+def build_name_matcher(queries, case_sensitive):
+    """
+    Builds a predicate that tells whether a file name matches any of the queries, caching the result.
+    
+    Plain substring queries are matched with `in` instead of the regex engine,
+    and the remaining regular expressions are combined into a single alternation.
+    
+    Args:
+        queries (tuple[str]): Non-empty search queries
+        case_sensitive (bool): Whether the search is case sensitive
+        
+    Returns:
+        callable: A function taking a name and returning a truthy value if it matches
+        
+    Raises:
+        re.error: If a query is not a valid regular expression
+    """
+    literal_queries = tuple(query for query in queries if is_literal_query(query))
+    regex_queries = tuple(query for query in queries if not is_literal_query(query))
+
+    regex_matches = None
+    if regex_queries:
+        regex_matches = _build_regex_matcher(regex_queries, 0 if case_sensitive else re.IGNORECASE)
+    if not literal_queries:
+        return regex_matches
+
+    literal_matches = _build_literal_matcher(literal_queries, case_sensitive)
+    if regex_matches is None:
+        return literal_matches
+
+    # 일반 문자열 검색어를 먼저 검사하고, 일치하지 않을 때만 정규식 엔진 사용
+    def matches(name):
+        return literal_matches(name) or regex_matches(name)
+    return matches
 
 def toggle_selection(node):
     """
@@ -16,15 +297,55 @@ def toggle_selection(node):
     Args:
         node (Node): The node to toggle
     """
-    node.selected = not node.selected
+    # 하위 디렉토리도 다시 뒤집지 않고 모두 같은 상태로 맞춤
+    set_subtree_selected(node, not node.selected)
 
-    if node.is_dir and node.children:
-        for child in node.children.values():
-            child.selected = node.selected
-            if child.is_dir:
-                toggle_selection(child)
+def splice_subtree_rows(visible_nodes, node, index=None):
+    """
+    Updates a list of visible nodes in place after a directory was expanded or collapsed.
+    
+    Only the rows below the directory are replaced, so when its row index is given
+    the cost is proportional to the size of its subtree rather than the whole tree.
+    
+    Args:
+        visible_nodes (list): List of (Node, level) tuples containing the directory
+        node (Node): The directory whose expanded state changed
+        index (int, optional): Row of the directory in visible_nodes, searched for if omitted
+        
+    Returns:
+        int: Change in the number of file rows, or None if the directory is not in the list
+    """
+    if index is None:
+        # 루트의 자식이 0 레벨이므로 조상 수 - 1이 표시 레벨
+        level = -1
+        parent = node.parent
+        while parent is not None:
+            level += 1
+            parent = parent.parent
+
+        try:
+            index = visible_nodes.index((node, level))
+        except ValueError:
+            return None
+    else:
+        level = visible_nodes[index][1]
+
+    # 디렉토리 바로 아래에서 더 깊은 레벨의 행들이 기존 하위 트리
+    end = index + 1
+    count = len(visible_nodes)
+    while end < count and visible_nodes[end][1] > level:
+        end += 1
+
+    removed_files = sum(1 for row in range(index + 1, end) if not visible_nodes[row][0].is_dir)
+    if node.expanded:
+        # flatten_tree(node)는 node 자신을 0 레벨로 포함하므로 제외하고 레벨을 보정
+        rows = [(child, child_level + level) for child, child_level in flatten_tree(node)[1:]]
+        visible_nodes[index + 1:end] = rows
+        return sum(1 for child, _ in rows if not child.is_dir) - removed_files
+    del visible_nodes[index + 1:end]
+    return -removed_files
 
-def toggle_expand(node, search_mode=False, search_query=None, original_nodes=None, apply_search_filter_func=None):
+def toggle_expand(node, search_mode=False, search_query=None, original_nodes=None, apply_search_filter_func=None, visible_nodes=None):
     """
     Expand or collapse a directory.
     
@@ -34,6 +355,7 @@ def toggle_expand(node, search_mode=False, search_query=None, original_nodes=Non
         search_query (str): The current search query
         original_nodes (list): Original list of nodes before search
         apply_search_filter_func (callable): Function to apply search filter
+        visible_nodes (list, optional): Current list of visible nodes to update in place
         
     Returns:
         list: Updated list of visible nodes
@@ -42,6 +364,8 @@ def toggle_expand(node, search_mode=False, search_query=None, original_nodes=Non
         node.expanded = not node.expanded
         # 검색 모드가 아닐 때만 보이는 노드 목록 업데이트
         if not search_mode and not search_query:
+            if visible_nodes is not None and splice_subtree_rows(visible_nodes, node) is not None:
+                return visible_nodes
             return flatten_tree(node.parent if node.parent else node)
         elif search_query and apply_search_filter_func:
             # 검색이 활성화된 경우 필터링을 다시 적용
@@ -56,19 +380,7 @@ def select_all(root_node, select=True):
         root_node (Node): The root node
         select (bool): Whether to select or deselect
     """
-    def _select_recursive(node):
-        """
-        Recursively sets the selected state of a node and its children.
-        
-        Args:
-            node (Node): The node to set.
-        """
-        node.selected = select
-        if node.is_dir and node.children:
-            for child in node.children.values():
-                _select_recursive(child)
-
-    _select_recursive(root_node)
+    set_subtree_selected(root_node, select)
 
 def expand_all(root_node, expand=True):
     """
@@ -81,98 +393,74 @@ def expand_all(root_node, expand=True):
     Returns:
         list: Updated list of visible nodes
     """
-    def _set_expanded(node, expand):
-        """
-        Sets the expanded state of the node and its children.
-        
-        Args:
-            node (Node): The node to set
-            expand (bool): Whether to expand
-        """
+    # 자식이 있는 디렉토리만 상태 변경 (재귀 호출 없이 순회)
+    for node in iter_subtree(root_node):
         if node.is_dir and node.children:
             node.expanded = expand
-            for child in node.children.values():
-                _set_expanded(child, expand)
-
-    _set_expanded(root_node, expand)
     return flatten_tree(root_node)
 
-def apply_search_filter(search_queries: list[str], case_sensitive: bool, root_node, original_nodes: list, visible_nodes_out: list):
+def apply_search_filter(search_queries: "list[str] | str", case_sensitive: bool, root_node, original_nodes: list, visible_nodes_out: list, all_nodes: list = None):
     """
     Filter files based on a list of search queries.
     
     Args:
-        search_queries (list[str]): The list of search queries.
+        search_queries (list[str] | str): The list of search queries, or a single query.
         case_sensitive (bool): Whether the search is case sensitive.
         root_node (Node): The root node of the file tree.
         original_nodes (list): The original list of nodes to restore if search is cleared or invalid.
         visible_nodes_out (list): Output parameter for the filtered list of (Node, level) tuples.
+        all_nodes (list, optional): Already flattened (Node, level) tuples of root_node to search instead of flattening again.
         
     Returns:
         tuple: (success, error_message)
                success (bool): True if the filter was applied successfully or cleared, False otherwise.
                error_message (str): An error message if success is False, otherwise an empty string.
     """
-    if not search_queries or all(not query or query.isspace() for query in search_queries):
+    # 단일 검색어 문자열도 같은 경로로 처리
+    if isinstance(search_queries, str):
+        search_queries = [search_queries]
+    valid_queries = tuple(query for query in search_queries if query and not query.isspace())
+    if not valid_queries: # All queries were empty or whitespace
         visible_nodes_out[:] = original_nodes
         return True, ""
 
-    compiled_patterns = []
-    flags = 0 if case_sensitive else re.IGNORECASE
-
-    for query in search_queries:
-        if query and not query.isspace():
-            try:
-                compiled_patterns.append(re.compile(query, flags))
-            except re.error:
-                return False, "잘못된 정규식" # Invalid regular expression
+    try:
+        matches = build_name_matcher(valid_queries, case_sensitive)
+    except re.error:
+        return False, "잘못된 정규식" # Invalid regular expression
 
-    if not compiled_patterns: # All queries were empty or whitespace
-        visible_nodes_out[:] = original_nodes
-        return True, ""
+    if all_nodes is None:
+        all_nodes = flatten_tree(root_node) # This gives a list of (Node, level) tuples
 
-    all_nodes = flatten_tree(root_node) # This gives a list of (Node, level) tuples
-
-    matching_file_nodes = []
-    for node, level in all_nodes:
-        if not node.is_dir: # Only match against file names
-            for pattern in compiled_patterns:
-                if pattern.search(node.name):
-                    matching_file_nodes.append(node)
-                    break # OR condition: if one pattern matches, it's a match
+    # all_nodes는 전위 순서이므로 역순으로 한 번 훑으면 자식이 항상 부모보다 먼저 처리됨.
+    # 파일은 검색어와 일치하면, 디렉토리는 보이는 자식이 하나라도 있으면 포함 (OR condition)
+    visible_nodes_set = set()
+    filtered_visible_nodes = []
+    # 노드 수만큼 반복되는 루프이므로 메서드 조회를 지역 변수로 미리 바인딩
+    add_visible = visible_nodes_set.add
+    no_visible_child = visible_nodes_set.isdisjoint
+    append_row = filtered_visible_nodes.append
+    for row in reversed(all_nodes):
+        node = row[0]
+        if node.is_dir:
+            children = node.children
+            if not children or no_visible_child(children.values()):
+                continue
+            # Ensure parent directories are expanded if they have visible children
+            node.expanded = True
+        elif not matches(node.name):
+            continue
+        add_visible(node)
+        append_row(row)
 
-    if not matching_file_nodes:
+    if not filtered_visible_nodes:
         visible_nodes_out[:] = [] # Empty list as per requirement
         return False, "검색 결과 없음" # No search results
-        
-    visible_nodes_set = set(matching_file_nodes)
-    for node in matching_file_nodes:
-        parent = node.parent
-        while parent:
-            visible_nodes_set.add(parent)
-            parent = parent.parent
 
     # Preserve original tree order and structure for visible nodes
-    # all_nodes is already in the correct order
-    filtered_visible_nodes = []
-    for node, level in all_nodes:
-        if node in visible_nodes_set:
-            filtered_visible_nodes.append((node, level))
-            # Ensure parent directories are expanded if they have visible children
-            if node.is_dir and node.children and any(child in visible_nodes_set for child in node.children.values()):
-                node.expanded = True
-
-
+    filtered_visible_nodes.reverse()
     visible_nodes_out[:] = filtered_visible_nodes
 
-    # It's possible that root_node itself is not in visible_nodes_set (e.g. if it's a dir and has no matching children)
-    # However, the prompt implies that original tree structure should be preserved for *these* visible nodes.
-    # If visible_nodes_out is not empty, and root_node is an ancestor of some node in visible_nodes_out,
-    # it should be included. The current logic with visible_nodes_set and iterating all_nodes should handle this.
-    # The old check `if not any(node[0] == root_node for node in visible_nodes_out):` might be too aggressive
-    # if the root itself doesn't match and has no direct matching children but is an ancestor.
-    # The current construction of `filtered_visible_nodes` should correctly include the root if it's part of the path to a visible node.
-
     return True, ""
 
 def toggle_current_dir_selection(current_node):
@@ -184,8 +472,8 @@ def toggle_current_dir_selection(current_node):
     """
     # 현재 노드가 디렉토리인 경우, 그 직계 자식들만 선택 상태 전환
     if current_node.is_dir and current_node.children:
-        # 자식들의 대부분이 선택되었는지 확인하여 동작 결정
-        selected_count = sum(1 for child in current_node.children.values() if child.selected)
+        # 자식들의 대부분이 선택되었는지 확인하여 동작 결정 (자식을 순회하지 않고 카운터 사용)
+        selected_count = current_node.selected_children_count
         select_all = selected_count <= len(current_node.children) / 2
 
         # 모든 직계 자식들을 새 선택 상태로 설정
@@ -8,12 +8,57 @@ A module that provides UI components for file selection.
 
 import curses
 import re
+import time
 from filetree import flatten_tree, count_selected_files
 from selector_actions import (
     toggle_selection, toggle_expand, select_all, 
-    expand_all, apply_search_filter, toggle_current_dir_selection
+    expand_all, apply_search_filter, toggle_current_dir_selection,
+    is_query_refinement, splice_subtree_rows
 )
 
+# 트리 깊이별 들여쓰기 문자열 (행마다 "  " * level을 만들지 않도록 미리 생성)
+_INDENTS = tuple("  " * level for level in range(64))
+
+# 노드 유형/상태별 행 접두사
+_PREFIX_DIR_EXPANDED = "+ "
+_PREFIX_DIR_COLLAPSED = "- "
+_PREFIX_FILE_SELECTED = "✓ "
+_PREFIX_FILE_UNSELECTED = "☐ "
+
+# 클립보드 상태별 도움말 문자열 (매 프레임 포맷하지 않도록 미리 생성)
+_HELP_CLIPBOARD_ON = "A: Select all N: Deselect all B: Clipboard (ON)  X: Cancel  D: Complete"
+_HELP_CLIPBOARD_OFF = "A: Select all N: Deselect all B: Clipboard (OFF)  X: Cancel  D: Complete"
+
+# 검색어 구분자 (쉼표 또는 공백)
+_SEARCH_SEPARATORS = re.compile(r'[, ]+')
+
+# 트리가 바뀌지 않은 동안 보관하는 검색 결과 수
+_SEARCH_CACHE_SIZE = 16
+
+# 검색 오류 배너를 표시하는 시간(초)
+_ERROR_BANNER_SECONDS = 1.5
+
+# 커서만 움직이는 키 (맨 위/아래에서 누르면 화면이 바뀌지 않음)
+_CURSOR_KEYS = frozenset((curses.KEY_UP, curses.KEY_DOWN, ord('j'), ord('k')))
+
+# 검색어에서 한 글자를 지우는 키 (터미널마다 보내는 값이 다름)
+_BACKSPACE_KEYS = frozenset((curses.KEY_BACKSPACE, 127, 8))
+
+def _truncate_name(name, width):
+    """
+    Shortens a name to fit in the given width, marking the cut with "...".
+    
+    Args:
+        name (str): The name to display
+        width (int): Available number of columns
+        
+    Returns:
+        str: The name itself if it fits, otherwise its start followed by "..."
+    """
+    if len(name) <= width:
+        return name
+    return name[:max(width - 3, 0)] + "..."
+
 class FileSelector:
     """
     Classes that provide an interactive file selection interface based on curses
@@ -33,6 +78,14 @@ class FileSelector:
         self.current_index = 0
         self.scroll_offset = 0
         self.visible_nodes = flatten_tree(root_node)
+        # 트리 펼침 상태가 바뀌었을 때만 전체 트리를 다시 평탄화
+        self._flat_nodes = self.visible_nodes
+        self._total_count = sum(1 for node, _ in self._flat_nodes if not node.is_dir)
+        self._tree_dirty = False
+        # 같은 트리에 같은 검색어를 다시 적용하면 이전 결과를 재사용 (트리가 바뀌면 비움)
+        self._search_cache = {}
+        self._selected_count = None  # 선택 상태가 바뀌면 None으로 무효화
+        self._separator = ""  # 도움말 위 구분선 (update_dimensions에서 갱신)
         self.max_visible = 0
         self.height, self.width = 0, 0
         self.copy_to_clipboard = True  # 기본값: 클립보드 복사 활성화
@@ -46,9 +99,55 @@ class FileSelector:
         # self.filtered_nodes = [] # This seems unused, consider removing if not needed later
         self.original_nodes = []  # 검색 전 노드 상태 저장
         self.search_had_no_results = False # Flag for "검색 결과 없음"
+        # 잘못된 정규식 등 오류 배너: 입력을 막지 않도록 만료 시각까지만 draw_tree에서 표시
+        self._error_message = None
+        self._error_until = 0.0
         
         self.initialize_curses()
 
+    @property
+    def visible_nodes(self):
+        """List of (Node, level) tuples currently shown in the tree view."""
+        return self._visible_nodes
+
+    @visible_nodes.setter
+    def visible_nodes(self, nodes):
+        self._visible_nodes = nodes
+        self._row_index = None  # 목록이 바뀌면 행 인덱스 무효화
+        self._visible_count = None  # 보이는 파일 수도 목록이 바뀔 때만 다시 계산
+
+    def find_visible_index(self, node):
+        """
+        Returns the row of a node in visible_nodes in O(1).
+        
+        Args:
+            node (Node): The node to look up
+            
+        Returns:
+            int: Row index, or None if the node is not visible
+        """
+        if self._row_index is None:
+            self._row_index = {n: i for i, (n, _) in enumerate(self._visible_nodes)}
+        return self._row_index.get(node)
+
+    def move_to_parent(self, node):
+        """
+        Moves the cursor to the row of the node's parent directory.
+        
+        Args:
+            node (Node): The node under the cursor
+            
+        Returns:
+            bool: True if the cursor moved, False if the parent is the root or not visible
+        """
+        if node.parent is None or node.parent.parent is None:
+            return False
+        parent_index = self.find_visible_index(node.parent)
+        if parent_index is None:
+            return False
+        self.current_index = parent_index
+        return True
+
     def initialize_curses(self):
         """Initialise curses settings."""
         curses.start_color()
@@ -62,8 +161,19 @@ class FileSelector:
         curses.init_pair(6, curses.COLOR_RED, -1)      # 도움말 메시지
         curses.init_pair(7, curses.COLOR_CYAN, -1)     # 검색 모드 표시
 
+        # 그릴 때마다 color_pair()를 호출하지 않도록 색상 속성을 미리 계산
+        self._attr_selected_file = curses.color_pair(1)
+        self._attr_dir = curses.color_pair(2)
+        self._attr_selected_dir = curses.color_pair(3)
+        self._attr_file = curses.color_pair(4)
+        self._attr_highlight = curses.color_pair(5)
+        self._attr_help = curses.color_pair(6)
+        self._attr_search = curses.color_pair(7)
+
         # 커서 숨기기
         curses.curs_set(0)
+        # 커서가 보이지 않으므로 화면 갱신 후 커서 위치를 되돌리는 이동 출력을 생략
+        self.stdscr.leaveok(True)
 
         # 특수 키 활성화
         self.stdscr.keypad(True)
@@ -75,17 +185,70 @@ class FileSelector:
         """Update the screen size."""
         self.height, self.width = self.stdscr.getmaxyx()
         self.max_visible = self.height - 6  # 상단에 통계를 위한 라인 추가
+        # 구분선은 화면 폭이 바뀔 때만 다시 생성
+        if len(self._separator) != self.width:
+            self._separator = "━" * self.width
 
     def expand_all(self, expand=True):
         """Expand or collapse all directories."""
         result = expand_all(self.root_node, expand)
         self.visible_nodes = result
+        self._tree_dirty = True
+
+    def toggle_expand(self, node):
+        """Expand or collapse a directory and refresh the visible nodes."""
+        # 검색 중이 아니고 전체 트리 목록을 보고 있으면 해당 디렉토리 아래 행만 갱신
+        if (node.is_dir and not self.search_mode and not self.search_input_str
+                and not self._tree_dirty and self.visible_nodes is self._flat_nodes):
+            # 토글하는 디렉토리는 보통 커서 위치에 있으므로 목록을 검색하지 않음
+            index = self.current_index
+            if not (0 <= index < len(self._flat_nodes) and self._flat_nodes[index][0] is node):
+                index = self.find_visible_index(node)
+            if index is not None:
+                node.expanded = not node.expanded
+                # 다시 평탄화하거나 전체를 세지 않고 바뀐 파일 행 수만 반영
+                self._total_count += splice_subtree_rows(self._flat_nodes, node, index)
+                self._row_index = None
+                self._visible_count = None
+                self._search_cache.clear()
+                return
+
+        # 검색 중이면 toggle_expand 안에서 필터가 다시 적용되므로 먼저 무효화
+        self._tree_dirty = True
+        result = toggle_expand(node, self.search_mode, self.search_input_str,
+                               self.original_nodes, self.apply_search_filter,
+                               self.visible_nodes)
+        if result:
+            self.visible_nodes = result
+
+    def full_tree_nodes(self):
+        """
+        Returns the flattened tree, reflattening only after the expanded state changed.
+        
+        Returns:
+            list: List of (Node, level) tuples for the whole visible tree
+        """
+        if self._tree_dirty:
+            self._flat_nodes = flatten_tree(self.root_node)
+            self._total_count = sum(1 for node, _ in self._flat_nodes if not node.is_dir)
+            self._tree_dirty = False
+            self._search_cache.clear()
+        return self._flat_nodes
 
     def toggle_current_dir_selection(self):
         """Toggles the selection status of only files in the current directory (no subdirectories)."""
         if self.current_index < len(self.visible_nodes):
             current_node, _ = self.visible_nodes[self.current_index]
+            # 상태가 바뀌는 파일은 현재 노드 또는 그 직계 자식 파일뿐이므로 그 차이만 반영
+            # (빈 디렉토리는 자기 자신만 바뀌며 디렉토리는 선택 수에 포함되지 않음)
+            if current_node.is_dir:
+                files = [child for child in (current_node.children or {}).values() if not child.is_dir]
+            else:
+                files = [current_node]
+            before = sum(1 for file_node in files if file_node.selected)
             toggle_current_dir_selection(current_node)
+            if self._selected_count is not None:
+                self._selected_count += sum(1 for file_node in files if file_node.selected) - before
 
     def toggle_search_mode(self):
         """Turn search mode on or off."""
@@ -142,13 +305,13 @@ class FileSelector:
         elif ch in (10, 13):  # Enter
             self.search_input_str = self.search_buffer
             # Split by comma or space, and filter out empty strings
-            raw_patterns = re.split(r'[, ]+', self.search_input_str)
+            raw_patterns = _SEARCH_SEPARATORS.split(self.search_input_str)
             self.search_patterns_list = [p for p in raw_patterns if p]
 
             self.search_mode = False  # Exit search mode after submitting
             self.apply_search_filter()
             return True
-        elif ch == curses.KEY_BACKSPACE or ch == 127 or ch == 8:  # Backspace
+        elif ch in _BACKSPACE_KEYS:  # Backspace
             # 검색어에서 한 글자 삭제
             self.search_buffer = self.search_buffer[:-1]
             return True
@@ -175,21 +338,48 @@ class FileSelector:
             self.search_patterns_list = []
             return
 
+        # 이미 평탄화된 전체 트리 목록을 검색에 재사용
+        all_nodes = self.full_tree_nodes()
+
         # If this is the first real search operation (original_nodes is not yet set),
         # store the current complete list of nodes.
         if not self.original_nodes:
             # This assumes visible_nodes currently holds the full, unfiltered list.
             # This should be true if original_nodes is empty.
-            self.original_nodes = list(flatten_tree(self.root_node)) # Ensure it's the full list
-
-        # self.visible_nodes is passed as an output parameter and will be modified in place.
-        success, error_message = apply_search_filter(
-            self.search_patterns_list,
-            self.case_sensitive, 
-            self.root_node, 
-            self.original_nodes, # Pass the true original list for reference
-            self.visible_nodes  # This list will be modified
-        )
+            self.original_nodes = list(all_nodes) # Ensure it's the full list
+
+        # 검색어와 대소문자 설정이 같으면 트리가 바뀌지 않은 동안 결과가 같으므로 캐시 사용.
+        # 결과의 디렉토리는 이미 펼쳐져 있던 것들이라 expanded 변경을 다시 할 필요 없음
+        cache_key = (tuple(self.search_patterns_list), self.case_sensitive)
+        cached = self._search_cache.pop(cache_key, None)
+        if cached is None:
+            # 이전 검색어를 좁힌 검색이면 전체 트리 대신 가장 작은 이전 결과 안에서만 검색
+            candidate_nodes = all_nodes
+            for (previous_patterns, previous_case), (_, _, previous_rows) in self._search_cache.items():
+                if (previous_case == self.case_sensitive
+                        and len(previous_rows) < len(candidate_nodes)
+                        and is_query_refinement(cache_key[0], previous_patterns, self.case_sensitive)):
+                    candidate_nodes = previous_rows
+
+            # 평탄화된 전체 트리 목록을 덮어쓰지 않도록 새 출력 목록에 결과를 받음
+            filtered_nodes = []
+            success, error_message = apply_search_filter(
+                self.search_patterns_list,
+                self.case_sensitive,
+                self.root_node,
+                self.original_nodes, # Pass the true original list for reference
+                filtered_nodes,      # This list will be filled with the result
+                candidate_nodes
+            )
+            cached = (success, error_message, tuple(filtered_nodes))
+            # 가장 오래 쓰지 않은 결과부터 버림 (dict는 삽입 순서를 유지)
+            if len(self._search_cache) >= _SEARCH_CACHE_SIZE:
+                del self._search_cache[next(iter(self._search_cache))]
+        # 최근에 쓴 결과가 뒤에 오도록 다시 넣음
+        self._search_cache[cache_key] = cached
+        success, error_message, filtered_rows = cached
+        if success or error_message == "검색 결과 없음":
+            self.visible_nodes = list(filtered_rows)
         
         if not success:
             if error_message == "검색 결과 없음":
@@ -200,9 +390,9 @@ class FileSelector:
             # For "검색 결과 없음", draw_tree will handle the specific message.
             # For other errors like "잘못된 정규식", show a temporary message.
             if error_message != "검색 결과 없음": # Avoid double messaging for "no results"
-                self.stdscr.addstr(self.height - 2, 1, f"Error: {error_message}", curses.color_pair(6))
-                self.stdscr.refresh()
-                curses.napms(1500) # Show message for a bit
+                # 잠시 멈춰 보여주면 그동안 키 입력이 막히므로 다음 그리기들에서 배너로 표시
+                self._error_message = f"Error: {error_message}"
+                self._error_until = time.monotonic() + _ERROR_BANNER_SECONDS
         # No explicit return needed if success is True, visible_nodes is updated.
 
     def handle_vim_navigation(self, ch):
@@ -217,37 +407,31 @@ class FileSelector:
             if self.current_index < len(self.visible_nodes):
                 node, _ = self.visible_nodes[self.current_index]
                 if node.is_dir and node.expanded:
-                    result = toggle_expand(node, self.search_mode, self.search_input_str,
-                                        self.original_nodes, self.apply_search_filter)
-                    if result:
-                        self.visible_nodes = result
+                    self.toggle_expand(node)
+                    return True
+                elif self.move_to_parent(node):  # 부모로 이동 (루트 제외)
                     return True
-                elif node.parent and node.parent.parent:  # 부모로 이동 (루트 제외)
-                    # 부모의 인덱스 찾기
-                    for i, (n, _) in enumerate(self.visible_nodes):
-                        if n == node.parent:
-                            self.current_index = i
-                            return True
         elif ch == ord('l'):  # 디렉토리 열기
             if self.current_index < len(self.visible_nodes):
                 node, _ = self.visible_nodes[self.current_index]
                 if node.is_dir and not node.expanded:
-                    result = toggle_expand(node, self.search_mode, self.search_input_str,
-                                         self.original_nodes, self.apply_search_filter)
-                    if result:
-                        self.visible_nodes = result
+                    self.toggle_expand(node)
                     return True
         return False
 
     def draw_tree(self):
         """Draw a file tree."""
-        self.stdscr.clear()
-        self.update_dimensions()
+        # clear()는 매 프레임 전체 화면을 다시 보내게 하므로, erase()로 지우고
+        # 실제로 바뀐 셀만 터미널에 전송되도록 curses의 화면 비교에 맡김
+        self.stdscr.erase()
+
+        # 펼침 상태가 바뀐 경우에만 전체 트리를 다시 평탄화
+        flat_nodes = self.full_tree_nodes()
 
         # Update visible_nodes based on current state
         if not self.search_mode and not self.search_input_str:
-            if not self.original_nodes: # No prior search or search fully cleared
-                self.visible_nodes = flatten_tree(self.root_node)
+            if not self.original_nodes and self.visible_nodes is not flat_nodes: # No prior search or search fully cleared
+                self.visible_nodes = flat_nodes
             # If self.original_nodes exists, visible_nodes should have been restored by clear/ESC logic
         # If a search IS active (self.search_input_str is not empty), visible_nodes is managed by apply_search_filter
 
@@ -264,13 +448,18 @@ class FileSelector:
             self.scroll_offset = self.current_index - self.max_visible + 1
 
         # 1번째 줄에 통계 표시 (첫 번째 항목을 가리지 않도록)
-        selected_count = count_selected_files(self.root_node)
-        total_count = sum(1 for node, _ in flatten_tree(self.root_node) if not node.is_dir)
-        visible_count = len([1 for node, _ in self.visible_nodes if not node.is_dir])
+        if self._selected_count is None:
+            self._selected_count = count_selected_files(self.root_node)
+        selected_count = self._selected_count
+        total_count = self._total_count
 
         # 검색 모드 상태 표시
         # Line 0 for search status / general status
         if self.search_mode or self.search_input_str:
+            # 보이는 파일 수는 검색 중에만 표시하므로 이때만, 목록이 바뀐 뒤 한 번만 계산
+            if self._visible_count is None:
+                self._visible_count = sum(1 for node, _ in self.visible_nodes if not node.is_dir)
+            visible_count = self._visible_count
             search_text_display = self.search_buffer if self.search_mode else self.search_input_str
             search_display_line = f"Search: {search_text_display}"
             case_status = "Case-sensitive" if self.case_sensitive else "Ignore case"
@@ -280,8 +469,8 @@ class FileSelector:
             if len(search_display_line) > max_search_len:
                 search_display_line = search_display_line[:max_search_len-3] + "..."
 
-            self.stdscr.addstr(0, 0, search_display_line, curses.color_pair(7) | curses.A_BOLD)
-            self.stdscr.addstr(0, len(search_display_line) + 2, f"({case_status})", curses.color_pair(7))
+            self.stdscr.addstr(0, 0, search_display_line, self._attr_search | curses.A_BOLD)
+            self.stdscr.addstr(0, len(search_display_line) + 2, f"({case_status})", self._attr_search)
 
             # Show "Show: X/Y" to the right
             stats_show_text = f"Show: {visible_count}/{total_count}"
@@ -295,45 +484,86 @@ class FileSelector:
         # Display "일치하는 파일 없음" if applicable (line 2 or 3 based on layout)
         if self.search_input_str and self.search_had_no_results and not self.visible_nodes:
             message_y = 2 # Start message on line 2
-            self.stdscr.addstr(message_y, 0, "일치하는 파일 없음", curses.color_pair(6))
+            self.stdscr.addstr(message_y, 0, "일치하는 파일 없음", self._attr_help)
         else:
             # Draw the tree starting from line 2
+            # 화면에 보이는 행만 그림. newpad로 트리 전체를 그려 두는 방식은 패드 크기가
+            # 32767행으로 제한되어 큰 저장소에서 쓸 수 없고, erase()+doupdate()로 이미
+            # 스크롤 시에도 바뀐 셀만 터미널에 전송되므로 사용하지 않음
+            # 행마다 반복되는 속성 조회를 지역 변수로 미리 바인딩
+            addstr = self.stdscr.addstr
+            width = self.width
+            cursor_y = self.current_index - self.scroll_offset + 2
             for i, (node, level) in enumerate(self.visible_nodes[self.scroll_offset:self.scroll_offset + self.max_visible]):
                 y = i + 2  # Start tree drawing from line 2
                 if y >= self.max_visible + 2: # Adjust boundary
                     break
 
-                # 유형 및 선택 상태에 따라 색상 결정
-                if i + self.scroll_offset == self.current_index:
-                    attr = curses.color_pair(5) # Highlight
-                elif node.is_dir:
-                    attr = curses.color_pair(3) if node.selected else curses.color_pair(2)
-                else:
-                    attr = curses.color_pair(1) if node.selected else curses.color_pair(4)
+                # 행 내용과 색상은 깊이/펼침/선택 상태/화면 폭이 같으면 이전 프레임 것을 재사용
+                row_key = (level, node.expanded, node.selected, width)
+                cached = node._render_cache
+                if cached is None or cached[0] != row_key:
+                    # 유형 및 선택 상태에 따라 색상과 접두사 결정
+                    if node.is_dir:
+                        attr = self._attr_selected_dir if node.selected else self._attr_dir
+                        prefix = _PREFIX_DIR_EXPANDED if node.expanded else _PREFIX_DIR_COLLAPSED
+                    else:
+                        attr = self._attr_selected_file if node.selected else self._attr_file
+                        prefix = _PREFIX_FILE_SELECTED if node.selected else _PREFIX_FILE_UNSELECTED
+
+                    indent = _INDENTS[level] if level < len(_INDENTS) else "  " * level
 
-                indent = "  " * level
-                prefix = "+ " if node.is_dir and node.expanded else ("- " if node.is_dir else ("✓ " if node.selected else "☐ "))
+                    name_space = width - len(indent) - len(prefix) - 1 # Adjusted for potential border
+                    name_display = _truncate_name(node.name, name_space)
 
-                name_space = self.width - len(indent) - len(prefix) - 1 # Adjusted for potential border
-                name_display = node.name[:name_space] + ("..." if len(node.name) > name_space else "")
+                    cached = node._render_cache = (row_key, f"{indent}{prefix}{name_display}", attr)
+
+                if y == cursor_y:
+                    attr = self._attr_highlight # Highlight
+                else:
+                    attr = cached[2]
 
-                self.stdscr.addstr(y, 0, f"{indent}{prefix}{name_display}", attr)
+                addstr(y, 0, cached[1], attr)
 
         # 화면 하단에 도움말 표시
         help_y = self.height - 4 # Adjusted for potentially one less line due to stats/search display
-        self.stdscr.addstr(help_y, 0, "━" * self.width)
+        self.stdscr.addstr(help_y, 0, self._separator)
         help_y += 1
         if self.search_mode:
-            self.stdscr.addstr(help_y, 0, "Search mode: type and press Enter to execute search, ESC to cancel, ^ to toggle case", curses.color_pair(7))
+            self.stdscr.addstr(help_y, 0, "Search mode: type and press Enter to execute search, ESC to cancel, ^ to toggle case", self._attr_search)
         else:
-            self.stdscr.addstr(help_y, 0, "↑/↓/j/k: Navigate SPACE: Select ←/→/h/l: Close/open folder /: Search", curses.color_pair(6))
+            self.stdscr.addstr(help_y, 0, "↑/↓/j/k: Navigate SPACE: Select ←/→/h/l: Close/open folder /: Search", self._attr_help)
         help_y += 1
-        self.stdscr.addstr(help_y, 0, "T: Toggle current folder only E: Expand all C: Collapse all", curses.color_pair(6))
+        self.stdscr.addstr(help_y, 0, "T: Toggle current folder only E: Expand all C: Collapse all", self._attr_help)
         help_y += 1
-        clip_status = "ON" if self.copy_to_clipboard else "OFF"
-        self.stdscr.addstr(help_y, 0, f"A: Select all N: Deselect all B: Clipboard ({clip_status})  X: Cancel  D: Complete", curses.color_pair(6))
+        help_line = _HELP_CLIPBOARD_ON if self.copy_to_clipboard else _HELP_CLIPBOARD_OFF
+        self.stdscr.addstr(help_y, 0, help_line, self._attr_help)
 
-        self.stdscr.refresh()
+        # 오류 배너는 만료될 때까지 도움말 위에 덧그림
+        if self._error_message is not None:
+            if time.monotonic() < self._error_until:
+                self.stdscr.addstr(self.height - 2, 1, self._error_message, self._attr_help)
+            else:
+                self._error_message = None
+
+        # 가상 화면에 모아 두었다가 한 번에 출력
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+
+    def has_pending_input(self):
+        """
+        Checks whether more keys are already waiting to be read.
+        
+        Returns:
+            bool: True if getch() would return immediately
+        """
+        self.stdscr.nodelay(True)
+        key = self.stdscr.getch()
+        self.stdscr.nodelay(False)
+        if key == -1:
+            return False
+        curses.ungetch(key)  # 읽은 키는 다음 getch()에서 다시 받도록 되돌림
+        return True
 
     def process_key(self, key):
         """키 입력을 처리합니다."""
@@ -368,10 +598,7 @@ class FileSelector:
             if self.current_index < len(self.visible_nodes):
                 node, _ = self.visible_nodes[self.current_index]
                 if node.is_dir and not node.expanded:
-                    result = toggle_expand(node, self.search_mode, self.search_input_str,
-                                         self.original_nodes, self.apply_search_filter)
-                    if result:
-                        self.visible_nodes = result
+                    self.toggle_expand(node)
                     # 검색 모드에서는 필터링 다시 적용
                     if self.search_input_str: # Use search_input_str
                         self.apply_search_filter()
@@ -381,33 +608,33 @@ class FileSelector:
             if self.current_index < len(self.visible_nodes):
                 node, _ = self.visible_nodes[self.current_index]
                 if node.is_dir and node.expanded:
-                    result = toggle_expand(node, self.search_mode, self.search_input_str,
-                                         self.original_nodes, self.apply_search_filter)
-                    if result:
-                        self.visible_nodes = result
+                    self.toggle_expand(node)
                     # 검색 모드에서는 필터링 다시 적용
                     if self.search_input_str: # Use search_input_str
                         self.apply_search_filter()
                     return True
-                elif node.parent and node.parent.parent:  # 부모로 이동 (루트 제외)
-                    # 부모의 인덱스 찾기
-                    for i, (n, _) in enumerate(self.visible_nodes):
-                        if n == node.parent:
-                            self.current_index = i
-                            return True
+                elif self.move_to_parent(node):  # 부모로 이동 (루트 제외)
+                    return True
         elif key == ord(' '):
             # 선택 전환 (검색 모드에서도 작동하도록 함)
             if self.current_index < len(self.visible_nodes):
                 node, _ = self.visible_nodes[self.current_index]
+                was_selected = node.selected
                 toggle_selection(node)
+                if node.is_dir:
+                    self._selected_count = None  # 하위 트리 전체가 바뀌므로 다시 계산
+                elif self._selected_count is not None and node.selected != was_selected:
+                    self._selected_count += 1 if node.selected else -1
                 return True
         elif key in [ord('a'), ord('A')]:
             # 모두 선택
             select_all(self.root_node, True)
+            self._selected_count = None
             return True
         elif key in [ord('n'), ord('N')]:
             # 모두 선택 해제
             select_all(self.root_node, False)
+            self._selected_count = 0
             return True
         elif key in [ord('e'), ord('E')]:
             # 모두 확장
@@ -436,9 +663,22 @@ class FileSelector:
 
     def run(self):
         """Launch the selection interface."""
+        needs_draw = True
         while True:
-            self.draw_tree()
+            # 붙여넣기나 키 반복으로 입력이 밀려 있으면 그리기를 건너뛰고 모두 처리한 뒤 한 번만 그림
+            if needs_draw and not self.has_pending_input():
+                self.draw_tree()
+                needs_draw = False
+            # 오류 배너가 떠 있으면 만료 시점에 지울 수 있도록 입력 대기 시간을 제한
+            banner_wait = self._error_message is not None
+            if banner_wait:
+                self.stdscr.timeout(max(1, int((self._error_until - time.monotonic()) * 1000)))
             key = self.stdscr.getch()
+            if banner_wait:
+                self.stdscr.timeout(-1)
+                if key == -1:  # 입력 없이 시간이 지남
+                    needs_draw = True
+                    continue
             
             # ESC 키 특별 처리: 검색 모드일 때와 검색 결과가 있을 때
             if key == 27:  # 27 = ESC
@@ -461,16 +701,24 @@ class FileSelector:
                 else:
                     # No active filter, not in search mode: exit
                     return False # Exit application
+                needs_draw = True
                 continue
             
             # 키 처리 결과에 따라 분기
             if key == curses.KEY_RESIZE:
-                # 창 크기 변경 처리
+                # 창 크기 변경 처리 (터미널 내용을 알 수 없으므로 다음 프레임은 전체 다시 그리기)
                 self.update_dimensions()
+                self.stdscr.clear()
+                needs_draw = True
                 continue
             
             # 키 처리
+            cursor_key = not self.search_mode and key in _CURSOR_KEYS
+            previous_index = self.current_index
             key_handled = self.process_key(key)
+            # 커서가 끝에 있어 이동하지 못했으면 그대로인 화면을 다시 그리지 않음
+            if not cursor_key or self.current_index != previous_index:
+                needs_draw = True
             
             # 종료 조건
             if not key_handled:
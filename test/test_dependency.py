@@ -16,29 +16,30 @@ import dependency
 class TestDependency(unittest.TestCase):
     """dependency.py 모듈의 함수들을 테스트하는 클래스"""
 
-    def setUp(self):
-        """테스트 준비"""
-        self.temp_dir = tempfile.mkdtemp()
+    @classmethod
+    def setUpClass(cls):
+        """테스트 준비 - 테스트들은 파일을 읽기만 하므로 클래스당 한 번만 생성"""
+        cls.temp_dir = tempfile.mkdtemp()
         
         # 다양한 언어로 된 테스트 파일 생성
-        self.python_file1 = os.path.join(self.temp_dir, "main.py")
-        self.python_file2 = os.path.join(self.temp_dir, "utils.py")
-        self.js_file = os.path.join(self.temp_dir, "app.js")
-        self.cpp_file = os.path.join(self.temp_dir, "program.cpp")
+        cls.python_file1 = os.path.join(cls.temp_dir, "main.py")
+        cls.python_file2 = os.path.join(cls.temp_dir, "utils.py")
+        cls.js_file = os.path.join(cls.temp_dir, "app.js")
+        cls.cpp_file = os.path.join(cls.temp_dir, "program.cpp")
         
         # 디렉토리 생성
-        os.makedirs(os.path.join(self.temp_dir, "lib"), exist_ok=True)
-        self.lib_file = os.path.join(self.temp_dir, "lib", "helper.py")
+        os.makedirs(os.path.join(cls.temp_dir, "lib"), exist_ok=True)
+        cls.lib_file = os.path.join(cls.temp_dir, "lib", "helper.py")
         
         # 파일 내용 정의
-        self.python_content1 = """
+        cls.python_content1 = """
 import os
 import sys
 from utils import format_string
 from lib.helper import Helper
 """
         
-        self.python_content2 = """
+        cls.python_content2 = """
 import os
 import datetime
 
@@ -46,54 +47,55 @@ def format_string(s):
     return s.strip()
 """
         
-        self.lib_content = """
+        cls.lib_content = """
 class Helper:
     def __init__(self):
         pass
 """
         
-        self.js_content = """
+        cls.js_content = """
 import React from 'react';
 import { useState } from 'react';
 const axios = require('axios');
 import './styles.css';
 """
         
-        self.cpp_content = """
+        cls.cpp_content = """
 #include <iostream>
 #include <vector>
 #include "lib/helper.hpp"
 """
         
         # 파일 작성
-        with open(self.python_file1, 'w') as f:
-            f.write(self.python_content1)
+        with open(cls.python_file1, 'w') as f:
+            f.write(cls.python_content1)
         
-        with open(self.python_file2, 'w') as f:
-            f.write(self.python_content2)
+        with open(cls.python_file2, 'w') as f:
+            f.write(cls.python_content2)
         
-        with open(self.lib_file, 'w') as f:
-            f.write(self.lib_content)
+        with open(cls.lib_file, 'w') as f:
+            f.write(cls.lib_content)
         
-        with open(self.js_file, 'w') as f:
-            f.write(self.js_content)
+        with open(cls.js_file, 'w') as f:
+            f.write(cls.js_content)
         
-        with open(self.cpp_file, 'w') as f:
-            f.write(self.cpp_content)
+        with open(cls.cpp_file, 'w') as f:
+            f.write(cls.cpp_content)
         
         # 파일 내용 리스트 생성
-        self.file_contents = [
-            ("main.py", self.python_content1),
-            ("utils.py", self.python_content2),
-            ("lib/helper.py", self.lib_content),
-            ("app.js", self.js_content),
-            ("program.cpp", self.cpp_content)
+        cls.file_contents = [
+            ("main.py", cls.python_content1),
+            ("utils.py", cls.python_content2),
+            ("lib/helper.py", cls.lib_content),
+            ("app.js", cls.js_content),
+            ("program.cpp", cls.cpp_content)
         ]
 
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """테스트 정리 - 임시 파일 삭제"""
         import shutil
-        shutil.rmtree(self.temp_dir)
+        shutil.rmtree(cls.temp_dir)
 
     def test_analyze_dependencies(self):
         """analyze_dependencies 함수 테스트"""
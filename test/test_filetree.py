@@ -13,7 +13,7 @@ import unittest
 from pathlib import Path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from filetree import Node, build_file_tree, flatten_tree, count_selected_files, collect_selected_content, collect_all_content
+from filetree import Node, build_file_tree, flatten_tree, count_selected_files, collect_selected_content, collect_all_content, sorted_children, iter_subtree, set_subtree_selected
 
 class TestNode(unittest.TestCase):
     """Node 클래스를 테스트하는 클래스"""
@@ -36,6 +36,9 @@ class TestNode(unittest.TestCase):
         self.assertIsNone(dir_node.parent)
         self.assertTrue(dir_node.selected)
         self.assertTrue(dir_node.expanded)
+
+        # __slots__로 속성이 고정되어 노드마다 __dict__가 생기지 않음
+        self.assertFalse(hasattr(dir_node, "__dict__"))
     
     def test_node_path(self):
         """Node의 path 프로퍼티가 올바른 경로를 반환하는지 테스트합니다."""
@@ -51,40 +54,81 @@ class TestNode(unittest.TestCase):
         grandchild = Node("grandchild.py", False, child)
         self.assertEqual(grandchild.path, "root" + os.sep + "child" + os.sep + "grandchild.py")
 
+        # 한 번 계산한 경로는 캐시되어 같은 객체를 반환
+        self.assertIs(grandchild.path, grandchild.path)
+
+    def test_sorted_children(self):
+        """sorted_children 함수가 디렉토리 우선, 이름순으로 정렬하고 자식 변경 시 다시 정렬하는지 테스트합니다."""
+        root = Node("root", True)
+        for name, is_dir in [("b.py", False), ("Zdir", True), ("a.py", False), ("adir", True)]:
+            root.children[name] = Node(name, is_dir, root)
+
+        names = [child.name for child in sorted_children(root)]
+        self.assertEqual(names, ["adir", "Zdir", "a.py", "b.py"])
+
+        # 캐시된 결과가 재사용되는지 확인
+        self.assertIs(sorted_children(root), sorted_children(root))
+
+        # 자식이 추가되면 정렬 결과가 갱신되어야 함
+        root.children["A.txt"] = Node("A.txt", False, root)
+        names = [child.name for child in sorted_children(root)]
+        self.assertEqual(names, ["adir", "Zdir", "a.py", "A.txt", "b.py"])
+
+        # 같은 수의 자식으로 교체해도 정렬 결과가 갱신되어야 함
+        del root.children["a.py"]
+        root.children["c.py"] = Node("c.py", False, root)
+        names = [child.name for child in sorted_children(root)]
+        self.assertEqual(names, ["adir", "Zdir", "A.txt", "b.py", "c.py"])
+        self.assertNotIn("a.py", [node.name for node, _ in flatten_tree(root)])
+
+        # 자식 dict를 통째로 바꿔도 갱신되며, 결과는 바꿀 수 없는 튜플
+        root.children = {"d.py": Node("d.py", False, root)}
+        self.assertEqual(sorted_children(root), (root.children["d.py"],))
+
+        # 파일 노드는 빈 튜플을 반환
+        self.assertEqual(sorted_children(root.children["d.py"]), ())
+
+# TestFileTree가 사용하는 디렉토리 구조: (상대 경로, 파일 내용), 디렉토리는 내용이 None
+_FIXTURE_SPEC = (
+    # 기본 디렉토리 구조와 파일
+    ("file1.txt", "File 1 content"),
+    ("dir1/file2.py", "File 2 content"),
+    ("dir2/file3.md", "File 3 content"),
+    ("dir2/subdir/file4.js", "File 4 content"),
+    # 무시할 파일과 디렉토리
+    (".git", None),
+    ("__pycache__", None),
+    (".DS_Store", ""),
+    ("dir1/temp.pyc", ""),
+    # .gitignore 테스트를 위한 추가 파일
+    ("ignored_file.txt", ""),
+    ("error.log", ""),
+    ("important.log", ""),
+    ("ignored_dir/some_file.txt", ""),
+)
+
 class TestFileTree(unittest.TestCase):
     """파일 트리 관련 함수들을 테스트하는 클래스"""
 
-    def setUp(self):
-        """테스트 전에 임시 디렉토리와 파일 구조를 생성합니다."""
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.test_dir = self.temp_dir.name
-
-        # 기본 디렉토리 구조 생성
-        os.makedirs(os.path.join(self.test_dir, "dir1"))
-        os.makedirs(os.path.join(self.test_dir, "dir2", "subdir"))
-
-        # 몇 가지 파일 생성
-        Path(os.path.join(self.test_dir, "file1.txt")).write_text("File 1 content")
-        Path(os.path.join(self.test_dir, "dir1", "file2.py")).write_text("File 2 content")
-        Path(os.path.join(self.test_dir, "dir2", "file3.md")).write_text("File 3 content")
-        Path(os.path.join(self.test_dir, "dir2", "subdir", "file4.js")).write_text("File 4 content")
-
-        # 무시할 파일과 디렉토리 생성
-        os.makedirs(os.path.join(self.test_dir, ".git"))
-        os.makedirs(os.path.join(self.test_dir, "__pycache__"))
-        Path(os.path.join(self.test_dir, ".DS_Store")).touch()
-        Path(os.path.join(self.test_dir, "dir1", "temp.pyc")).touch()
-        
-        # .gitignore 테스트를 위한 추가 파일 생성
-        Path(os.path.join(self.test_dir, "ignored_file.txt")).touch()
-        Path(os.path.join(self.test_dir, "error.log")).touch()
-        Path(os.path.join(self.test_dir, "important.log")).touch()
-        os.makedirs(os.path.join(self.test_dir, "ignored_dir"))
-        Path(os.path.join(self.test_dir, "ignored_dir", "some_file.txt")).touch()
-    
-    def tearDown(self):
-        """테스트 후에 임시 디렉토리를 정리합니다."""
-        self.temp_dir.cleanup()
+    @classmethod
+    def setUpClass(cls):
+        """클래스당 한 번 임시 디렉토리와 파일 구조를 생성합니다 (테스트는 디스크를 읽기만 함)."""
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.test_dir = cls.temp_dir.name
+
+        # 목록을 한 번 순회하며 필요한 상위 디렉토리까지 만들고 파일을 작성
+        for relpath, content in _FIXTURE_SPEC:
+            path = os.path.join(cls.test_dir, relpath)
+            if content is None:
+                os.makedirs(path, exist_ok=True)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                Path(path).write_text(content)
+
+    @classmethod
+    def tearDownClass(cls):
+        """모든 테스트 후에 임시 디렉토리를 정리합니다."""
+        cls.temp_dir.cleanup()
     
     def test_build_file_tree(self):
         """build_file_tree 함수가 올바른 파일 트리를 생성하는지 테스트합니다."""
@@ -167,6 +211,58 @@ class TestFileTree(unittest.TestCase):
         # dir2를 선택 해제했지만 그 안의 파일들의 selected 상태는 변경되지 않음
         self.assertEqual(count_selected_files(root_node), 6)  # dir2 선택 해제는 파일 수에 영향 없음
     
+    def test_selected_children_count(self):
+        """selected_children_count가 직계 자식의 선택 상태 변경을 따라가는지 테스트합니다."""
+        root_node = build_file_tree(self.test_dir)
+        dir1 = root_node.children["dir1"]
+
+        # 기본적으로 모든 자식이 선택됨
+        self.assertEqual(dir1.selected_children_count, len(dir1.children))
+
+        # 선택 해제/재선택 시 카운터 갱신, 같은 값 대입은 영향 없음
+        dir1.children["file2.py"].selected = False
+        dir1.children["file2.py"].selected = False
+        self.assertEqual(dir1.selected_children_count, len(dir1.children) - 1)
+        dir1.children["file2.py"].selected = True
+        self.assertEqual(dir1.selected_children_count, len(dir1.children))
+
+    def test_set_subtree_selected(self):
+        """set_subtree_selected 함수가 하위 트리 전체와 선택된 자식 수를 올바르게 설정하는지 테스트합니다."""
+        root_node = build_file_tree(self.test_dir)
+        dir2 = root_node.children["dir2"]
+
+        def assert_counters_consistent():
+            for node in iter_subtree(root_node):
+                if node.is_dir:
+                    expected = sum(1 for child in node.children.values() if child.selected)
+                    self.assertEqual(node.selected_children_count, expected)
+
+        set_subtree_selected(dir2, False)
+        self.assertTrue(all(not node.selected for node in iter_subtree(dir2)))
+        self.assertEqual(count_selected_files(root_node), 8 - 2)  # dir2 아래 파일 2개 해제
+        assert_counters_consistent()
+
+        set_subtree_selected(root_node, True)
+        self.assertEqual(count_selected_files(root_node), 8)
+        assert_counters_consistent()
+
+    def test_iter_subtree(self):
+        """iter_subtree 함수가 시작 노드와 모든 하위 노드를 순회하는지 테스트합니다."""
+        root_node = build_file_tree(self.test_dir)
+
+        # 시작 노드 자신이 가장 먼저 반환됨
+        nodes = list(iter_subtree(root_node))
+        self.assertIs(nodes[0], root_node)
+
+        # 접힌 디렉토리도 포함하여 전체 노드를 순회
+        root_node.children["dir2"].expanded = False
+        self.assertEqual(len(nodes), len(list(iter_subtree(root_node))))
+        self.assertEqual(len(nodes) - 1, len(flatten_tree(root_node, visible_only=False)))
+
+        # 파일 노드는 자기 자신만 반환
+        file_node = root_node.children["file1.txt"]
+        self.assertEqual(list(iter_subtree(file_node)), [file_node])
+
     def test_collect_selected_content(self):
         """collect_selected_content 함수가 선택된 파일의 내용을 올바르게 수집하는지 테스트합니다."""
         root_node = build_file_tree(self.test_dir)
@@ -229,11 +325,26 @@ class TestFileTree(unittest.TestCase):
         for exp_path in expected_paths:
             self.assertTrue(any(exp_path in p for p in paths), f"경로 {exp_path}가 결과에 없습니다")
             
+    def test_literal_ignore_patterns(self):
+        """와일드카드가 없는 이름 패턴과 와일드카드 패턴이 함께 올바르게 적용되는지 테스트합니다."""
+        root_node = build_file_tree(self.test_dir, ["dir1", "*.md", ".git", "__pycache__"])
+
+        root_children = list(root_node.children.keys())
+        self.assertNotIn("dir1", root_children)
+        self.assertNotIn(".git", root_children)
+        self.assertIn("dir2", root_children)
+
+        # 와일드카드 패턴은 하위 디렉토리에서도 적용됨
+        self.assertNotIn("file3.md", root_node.children["dir2"].children)
+        self.assertIn("subdir", root_node.children["dir2"].children)
+
     def test_gitignore_filtering(self):
         """`.gitignore` 패턴이 파일과 디렉토리를 올바르게 제외하는지 테스트합니다."""
-        # 테스트용 .gitignore 파일 생성
-        with open(os.path.join(self.test_dir, ".gitignore"), "w") as f:
+        # 테스트용 .gitignore 파일 생성 (공유 디렉토리이므로 테스트 후 삭제)
+        gitignore_path = os.path.join(self.test_dir, ".gitignore")
+        with open(gitignore_path, "w") as f:
             f.write("*.log\nignored_dir/\nignored_file.txt\n!important.log")
+        self.addCleanup(os.remove, gitignore_path)
         
         # 파일 트리 빌드
         root_node = build_file_tree(self.test_dir)
@@ -14,6 +14,7 @@ from unittest.mock import MagicMock, patch
 # 테스트 대상 모듈 임포트
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import output
+from filetree import Node
 
 class TestOutput(unittest.TestCase):
     """output.py 모듈의 함수들을 테스트하는 클래스"""
@@ -135,6 +136,42 @@ class TestOutput(unittest.TestCase):
         self.assertEqual(output.get_language_name("js"), "JavaScript")
         self.assertEqual(output.get_language_name("unknown"), "UNKNOWN")
 
+    def test_classify_dependencies(self):
+        """classify_dependencies 함수 테스트"""
+        internal = os.path.join("dir1", "file2.py")
+        dependencies = {
+            "file1.py": {internal, "sys", "os"},
+            internal: set()
+        }
+
+        classified = output.classify_dependencies(dependencies)
+
+        self.assertEqual(classified["file1.py"], ([internal], ["os", "sys"]))
+        self.assertEqual(classified[internal], ([], []))
+
+    def test_collect_tree_stats(self):
+        """collect_tree_stats 함수 테스트"""
+        root = Node("project", True)
+        src = Node("src", True, root)
+        docs = Node("docs", True, root)
+        main_py = Node("main.py", False, src)
+        readme = Node("README.md", False, docs)
+        setup_py = Node("setup.py", False, root)
+        root.children = {"src": src, "docs": docs, "setup.py": setup_py}
+        src.children = {"main.py": main_py}
+        docs.children = {"README.md": readme}
+
+        docs.expanded = False
+        setup_py.selected = False
+
+        stats = output.collect_tree_stats(root)
+
+        # 접힌 docs 아래의 파일은 전체 파일 수에서 제외됨
+        self.assertEqual(stats['total_files'], 2)
+        # 선택 상태는 펼침 여부와 무관하게 계산됨
+        self.assertEqual(stats['selected_files'], 2)
+        self.assertEqual([node.name for node in stats['main_dirs']], ["docs", "src"])
+
     def test_write_llm_optimized_output(self):
         """write_llm_optimized_output 함수 테스트"""
         # 간단한 파일 내용 및 의존성 설정
@@ -7,15 +7,18 @@ selector_actions.py 모듈의 함수들을 테스트하는 코드입니다.
 """
 
 import os
+import re
 import sys
 import unittest
 from pathlib import Path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from filetree import Node
+from filetree import Node, flatten_tree
 from selector_actions import (
     toggle_selection, toggle_expand, select_all, 
-    expand_all, apply_search_filter, toggle_current_dir_selection
+    expand_all, apply_search_filter, toggle_current_dir_selection,
+    is_literal_query, splice_subtree_rows, build_name_matcher, is_query_refinement,
+    _required_literals
 )
 
 class TestSelectorActions(unittest.TestCase):
@@ -108,6 +111,22 @@ class TestSelectorActions(unittest.TestCase):
         # 모든 디렉토리가 펼쳐있는지 확인
         check_expanded_state(self.root_node, True)
     
+    def test_toggle_selection_nested_directory(self):
+        """중첩된 디렉토리도 상위 디렉토리와 같은 선택 상태로 전환되는지 테스트합니다."""
+        dir2 = self.root_node.children["dir2"]
+        subdir = Node("subdir", True, dir2)
+        dir2.children["subdir"] = subdir
+        file4 = Node("file4.js", False, subdir)
+        subdir.children["file4.js"] = file4
+
+        toggle_selection(dir2)
+        self.assertFalse(subdir.selected)
+        self.assertFalse(file4.selected)
+
+        toggle_selection(dir2)
+        self.assertTrue(subdir.selected)
+        self.assertTrue(file4.selected)
+
     def test_toggle_expand(self):
         """toggle_expand 함수가 디렉토리의 확장 상태를 올바르게 전환하는지 테스트합니다."""
         dir1 = self.root_node.children["dir1"]
@@ -127,6 +146,31 @@ class TestSelectorActions(unittest.TestCase):
         # 다시 원래 상태로 돌아왔는지 확인
         self.assertTrue(dir1.expanded)
     
+    def test_toggle_expand_splices_visible_nodes(self):
+        """toggle_expand가 보이는 노드 목록을 전체 평탄화 결과와 같게 갱신하는지 테스트합니다."""
+        dir2 = self.root_node.children["dir2"]
+        subdir = Node("subdir", True, dir2)
+        dir2.children["subdir"] = subdir
+        subdir.children["file4.js"] = Node("file4.js", False, subdir)
+
+        visible_nodes = flatten_tree(self.root_node)
+        for node in (subdir, dir2, dir2, subdir):
+            result = toggle_expand(node, visible_nodes=visible_nodes)
+            self.assertIs(result, visible_nodes)
+            self.assertEqual(visible_nodes, flatten_tree(self.root_node))
+
+        # 행 위치를 알려주면 그 행부터 갱신하고 바뀐 파일 행 수를 반환
+        index = visible_nodes.index((dir2, 0))
+        dir2.expanded = False
+        self.assertEqual(splice_subtree_rows(visible_nodes, dir2, index), -2)
+        self.assertEqual(visible_nodes, flatten_tree(self.root_node))
+        dir2.expanded = True
+        self.assertEqual(splice_subtree_rows(visible_nodes, dir2, index), 2)
+        self.assertEqual(visible_nodes, flatten_tree(self.root_node))
+
+        # 목록에 없는 디렉토리는 갱신하지 않음
+        self.assertIsNone(splice_subtree_rows([], dir2))
+
     def test_toggle_current_dir_selection(self):
         """toggle_current_dir_selection 함수가 현재 디렉토리의 파일들만 선택 상태를 전환하는지 테스트합니다."""
         dir1 = self.root_node.children["dir1"]
@@ -195,6 +239,131 @@ class TestSelectorActions(unittest.TestCase):
         # self.assertEqual(visible_nodes, original_nodes) # 이전 동작
         self.assertEqual(len(visible_nodes), 0) # 수정된 동작: 빈 리스트여야 함
 
+    def test_apply_search_filter_literal_query(self):
+        """메타문자가 없는 검색어가 대소문자 구분 설정에 맞게 부분 문자열로 검색되는지 테스트합니다."""
+        self.assertTrue(is_literal_query("file2"))
+        self.assertFalse(is_literal_query(r"\.py$"))
+
+        # 대소문자 무시
+        visible_nodes = []
+        success, error_message = apply_search_filter(["FILE2"], False, self.root_node, [], visible_nodes)
+        self.assertTrue(success)
+        self.assertEqual(error_message, "")
+        self.assertEqual([node.name for node, _ in visible_nodes], ["dir1", "file2.py"])
+
+        # 대소문자 구분
+        visible_nodes = []
+        success, error_message = apply_search_filter(["FILE2"], True, self.root_node, [], visible_nodes)
+        self.assertFalse(success)
+        self.assertEqual(error_message, "검색 결과 없음")
+
+        # 여러 검색어는 OR 조건
+        visible_nodes = []
+        success, _ = apply_search_filter(["file2", "file3"], True, self.root_node, [], visible_nodes)
+        self.assertTrue(success)
+        self.assertEqual([node.name for node, _ in visible_nodes], ["dir1", "file2.py", "dir2", "file3.md"])
+
+    def test_apply_search_filter_multiple_regex_queries(self):
+        """여러 정규식 검색어가 하나의 패턴으로 합쳐져도 OR 조건으로 동작하는지 테스트합니다."""
+        visible_nodes = []
+        success, _ = apply_search_filter([r"\.py$", r"^file3"], True, self.root_node, [], visible_nodes)
+        self.assertTrue(success)
+        self.assertEqual([node.name for node, _ in visible_nodes], ["dir1", "file2.py", "dir2", "file3.md"])
+
+        # 역참조는 합치면 그룹 번호가 달라지므로 검색어별로 검사
+        dir1 = self.root_node.children["dir1"]
+        dir1.children["feed.txt"] = Node("feed.txt", False, dir1)
+        visible_nodes = []
+        success, _ = apply_search_filter([r"(z)\1", r"(e)\1"], True, self.root_node, [], visible_nodes)
+        self.assertTrue(success)
+        self.assertEqual([node.name for node, _ in visible_nodes], ["dir1", "feed.txt"])
+
+        # 조건부 그룹 참조도 그룹 번호를 쓰므로 검색어별로 검사
+        matches = build_name_matcher((r"(z)", r"(a)?(?(1)b|c)"), True)
+        self.assertTrue(matches("ab"))
+        self.assertFalse(matches("ad"))
+
+        # 단일 문자열 검색어도 목록과 같게 처리
+        visible_nodes = []
+        success, _ = apply_search_filter(r"\.py$", True, self.root_node, [], visible_nodes)
+        self.assertTrue(success)
+        self.assertEqual([node.name for node, _ in visible_nodes], ["dir1", "file2.py"])
+
+        # 같은 검색어 조합의 매처는 다시 만들지 않고 재사용
+        self.assertIs(build_name_matcher((r"\.py$", "^file3"), True),
+                      build_name_matcher((r"\.py$", "^file3"), True))
+
+        # 하나라도 잘못된 정규식이면 오류
+        success, error_message = apply_search_filter([r"\.py$", "("], True, self.root_node, [], [])
+        self.assertFalse(success)
+        self.assertEqual(error_message, "잘못된 정규식")
+
+    def test_build_name_matcher_literal_queries(self):
+        """일반 문자열 검색어와 정규식 검색어가 섞여도 같은 결과를 내는지 테스트합니다."""
+        # 일반 문자열 검색어 하나 / 여러 개, 대소문자 구분 여부
+        self.assertTrue(build_name_matcher(("Py",), False)("file2.py"))
+        self.assertFalse(build_name_matcher(("Py",), True)("file2.py"))
+        self.assertTrue(build_name_matcher(("zzz", "MD"), False)("file3.md"))
+        self.assertFalse(build_name_matcher(("zzz", "MD"), True)("file3.md"))
+
+        # 대소문자 무시 규칙은 ASCII 밖에서도 정규식 검색과 같아야 함 (ſ, 켈빈 기호 K 등)
+        names = ["ſ.py", "\u212aey.txt", "key.txt", "STRASSE.md", "straße.md"]
+        for queries in (("s",), ("S", "zzz"), ("k",), ("\u212a",), ("ſ",), ("ß", "zzz")):
+            matches = build_name_matcher(queries, False)
+            for name in names:
+                expected = any(re.search(query, name, re.IGNORECASE) for query in queries)
+                self.assertEqual(bool(matches(name)), expected, (queries, name))
+
+        # 일반 문자열과 정규식이 섞인 경우 둘 중 하나만 일치해도 포함
+        matches = build_name_matcher(("txt", r"\.py$"), True)
+        self.assertTrue(matches("file1.txt"))
+        self.assertTrue(matches("file2.py"))
+        self.assertFalse(matches("file3.md"))
+
+        # 섞여 있어도 잘못된 정규식은 오류
+        with self.assertRaises(re.error):
+            build_name_matcher(("txt", "("), True)
+
+    def test_regex_literal_prefilter(self):
+        """정규식의 필수 문자열 사전 검사가 정규식 검색과 같은 결과를 내는지 테스트합니다."""
+        self.assertEqual(_required_literals(r"^file_1.*\.md$"), ["file_1", ".md"])
+        # 수량자가 붙은 글자, 그룹, 문자 클래스는 필수 문자열에서 제외
+        self.assertEqual(_required_literals(r"ab?c(de)?[fg]h"), ["a", "c", "h"])
+        # 대체나 코드 값 이스케이프는 분석하지 않음
+        self.assertEqual(_required_literals(r"core|util"), [])
+        self.assertEqual(_required_literals(r"\x41bc"), [])
+        # 반복 횟수 형태가 아닌 {는 일반 문자이므로 뒤의 그룹과 문자 클래스를 건너뛰지 않음
+        self.assertEqual(_required_literals(r"ab{2}c"), ["a", "c"])
+        self.assertEqual(_required_literals(r"a{(}b)?c"), ["a{", "c"])
+
+        names = ["main.JS", "app.js", "readme.md", "İNDEX.js", "index.py"]
+        for query in (r"\d*\.js$", r"in.ex", r"^\w+\.md$"):
+            for case_sensitive in (True, False):
+                pattern = re.compile(query, 0 if case_sensitive else re.IGNORECASE)
+                matches = build_name_matcher((query,), case_sensitive)
+                for name in names:
+                    self.assertEqual(bool(matches(name)), bool(pattern.search(name)), (query, case_sensitive, name))
+
+        # 일반 문자 {가 포함된 정규식
+        cases = [(r"a{(}b)?c", "a{c"), (r"x{1,(}y)?z", "x{1,z"), (r"a{[}b]c", "a{}c"), (r"{[,d+}]", "{}d")]
+        for query, name in cases:
+            self.assertTrue(re.search(query, name))
+            self.assertTrue(build_name_matcher((query,), True)(name), query)
+
+    def test_is_query_refinement(self):
+        """새 검색어가 이전 검색어를 좁힌 경우만 이전 결과 안에서 검색 가능한지 테스트합니다."""
+        self.assertTrue(is_query_refinement(("core",), ("co",), True))
+        self.assertTrue(is_query_refinement(("Core", "xco"), ("co",), False))
+        self.assertFalse(is_query_refinement(("Core",), ("co",), True))
+        # 새 검색어 중 하나라도 이전 검색어를 포함하지 않으면 결과가 늘어날 수 있음
+        self.assertFalse(is_query_refinement(("core", "py"), ("co",), True))
+        # 정규식이 섞이면 포함 관계를 알 수 없으므로 사용하지 않음
+        self.assertFalse(is_query_refinement(("co.e",), ("co",), True))
+        self.assertFalse(is_query_refinement(("core",), ("c.",), True))
+        # 대소문자 무시 검색에서 ASCII가 아닌 검색어는 lower()로 비교하지 않음
+        self.assertFalse(is_query_refinement(("\u212aey",), ("k",), False))
+        self.assertTrue(is_query_refinement(("\u212aey",), ("\u212a",), True))
+
 
 # Helper to get node names from a list of (Node, level) tuples
 def get_node_names(nodes_with_levels):
@@ -14,8 +14,10 @@ from unittest.mock import patch, MagicMock
 from pathlib import Path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from filetree import Node
+from filetree import Node, flatten_tree, count_selected_files
+import selector_ui
 from selector_ui import FileSelector
+import selector_actions
 
 class TestFileSelector(unittest.TestCase):
     """FileSelector 클래스를 테스트하는 클래스"""
@@ -126,6 +128,187 @@ class TestFileSelector(unittest.TestCase):
             self.assertTrue(result)
             mock_toggle_expand.assert_called_once()
     
+    @patch('curses.color_pair')
+    @patch('curses.init_pair')
+    @patch('curses.start_color')
+    @patch('curses.use_default_colors')
+    @patch('curses.curs_set')
+    def test_navigate_to_parent(self, mock_curs_set, mock_use_default_colors, mock_start_color, mock_init_pair, mock_color_pair):
+        """h 키가 파일에서 부모 디렉토리 행으로 이동하는지 테스트합니다."""
+        selector = FileSelector(self.root_node, self.mock_stdscr)
+        names = [node.name for node, _ in selector.visible_nodes]
+
+        # dir2 아래의 file3.md에서 h 키를 누르면 dir2로 이동해야 함
+        selector.current_index = names.index("file3.md")
+        self.assertTrue(selector.handle_vim_navigation(ord('h')))
+        self.assertEqual(selector.current_index, names.index("dir2"))
+
+        # ← 키도 같은 방식으로 부모로 이동하고, 최상위 항목에서는 이동하지 않음
+        selector.current_index = names.index("file2.py")
+        self.assertTrue(selector.process_key(curses.KEY_LEFT))
+        self.assertEqual(selector.current_index, names.index("dir1"))
+        self.assertFalse(selector.move_to_parent(self.root_node.children["file1.txt"]))
+
+        # visible_nodes가 교체되면 행 인덱스도 새 목록 기준이어야 함
+        dir2 = self.root_node.children["dir2"]
+        selector.visible_nodes = [(dir2, 0), (dir2.children["file3.md"], 1)]
+        self.assertEqual(selector.find_visible_index(dir2), 0)
+        self.assertIsNone(selector.find_visible_index(self.root_node.children["dir1"]))
+
+    @patch('curses.doupdate')
+    @patch('curses.color_pair')
+    @patch('curses.init_pair')
+    @patch('curses.start_color')
+    @patch('curses.use_default_colors')
+    @patch('curses.curs_set')
+    def test_draw_tree_reuses_flattened_tree(self, mock_curs_set, mock_use_default_colors, mock_start_color, mock_init_pair, mock_color_pair, mock_doupdate):
+        """draw_tree가 펼침 상태가 바뀔 때만 트리를 다시 평탄화하는지 테스트합니다."""
+        mock_color_pair.return_value = 0
+        selector = FileSelector(self.root_node, self.mock_stdscr)
+
+        with patch('selector_ui.flatten_tree', wraps=flatten_tree) as mock_flatten:
+            # 커서 이동만으로는 다시 평탄화하지 않음
+            selector.draw_tree()
+            selector.process_key(ord('j'))
+            selector.draw_tree()
+            mock_flatten.assert_not_called()
+
+            # 모두 펼치기는 다음 그리기에서 한 번만 다시 평탄화
+            selector.process_key(ord('e'))
+            selector.draw_tree()
+            selector.draw_tree()
+            self.assertEqual(mock_flatten.call_count, 1)
+
+    @patch('curses.doupdate')
+    @patch('curses.color_pair')
+    @patch('curses.init_pair')
+    @patch('curses.start_color')
+    @patch('curses.use_default_colors')
+    @patch('curses.curs_set')
+    def test_toggle_expand_splices_rows(self, mock_curs_set, mock_use_default_colors, mock_start_color, mock_init_pair, mock_color_pair, mock_doupdate):
+        """디렉토리를 접고 펼칠 때 해당 행 아래만 갱신하고 전체 파일 수도 차이만 반영하는지 테스트합니다."""
+        mock_color_pair.return_value = 0
+        selector = FileSelector(self.root_node, self.mock_stdscr)
+        names = [node.name for node, _ in selector.visible_nodes]
+        selector.current_index = names.index("dir2")
+
+        with patch('selector_ui.flatten_tree', wraps=flatten_tree) as mock_flatten:
+            for key in (ord('h'), ord('l'), ord('h')):
+                selector.process_key(key)
+                selector.draw_tree()
+                self.assertEqual(selector.visible_nodes, flatten_tree(self.root_node))
+                self.assertEqual(selector._total_count,
+                                 sum(1 for node, _ in flatten_tree(self.root_node) if not node.is_dir))
+            mock_flatten.assert_not_called()
+
+        names = [node.name for node, _ in selector.visible_nodes]
+        self.assertNotIn("file3.md", names)
+
+    @patch('curses.doupdate')
+    @patch('curses.color_pair')
+    @patch('curses.init_pair')
+    @patch('curses.start_color')
+    @patch('curses.use_default_colors')
+    @patch('curses.curs_set')
+    def test_draw_tree_redraws_rows_with_changed_state(self, mock_curs_set, mock_use_default_colors, mock_start_color, mock_init_pair, mock_color_pair, mock_doupdate):
+        """선택 상태가 바뀐 행은 캐시된 문자열 대신 새로 그리는지 테스트합니다."""
+        mock_color_pair.return_value = 0
+        selector = FileSelector(self.root_node, self.mock_stdscr)
+        names = [node.name for node, _ in selector.visible_nodes]
+        row = names.index("file1.txt") + 2
+
+        file_node = self.root_node.children["file1.txt"]
+        selector.draw_tree()
+        self.mock_stdscr.addstr.assert_any_call(row, 0, "✓ file1.txt", 0)
+        file_node.selected = False
+        selector.draw_tree()
+        self.mock_stdscr.addstr.assert_any_call(row, 0, "☐ file1.txt", 0)
+
+    @patch('curses.doupdate')
+    @patch('curses.color_pair')
+    @patch('curses.init_pair')
+    @patch('curses.start_color')
+    @patch('curses.use_default_colors')
+    @patch('curses.curs_set')
+    def test_selected_count_updates_only_on_selection_changes(self, mock_curs_set, mock_use_default_colors, mock_start_color, mock_init_pair, mock_color_pair, mock_doupdate):
+        """선택 수를 선택 동작이 있을 때만 다시 세거나 차이만 반영하는지 테스트합니다."""
+        mock_color_pair.return_value = 0
+        # 빈 디렉토리와 하위 디렉토리만 가진 디렉토리 추가
+        empty_dir = Node("empty", True, self.root_node)
+        outer_dir = Node("outer", True, self.root_node)
+        inner_dir = Node("inner", True, outer_dir)
+        self.root_node.children["empty"] = empty_dir
+        self.root_node.children["outer"] = outer_dir
+        outer_dir.children["inner"] = inner_dir
+        inner_dir.children["file5.txt"] = Node("file5.txt", False, inner_dir)
+
+        selector = FileSelector(self.root_node, self.mock_stdscr)
+        names = [node.name for node, _ in selector.visible_nodes]
+
+        # 전체 선택 해제와 디렉토리 선택은 다음 그리기에서 다시 셈
+        selector.process_key(ord('n'))
+        selector.draw_tree()
+        self.mock_stdscr.addstr.assert_any_call(0, 0, "Selected Files: 0/4", curses.A_BOLD)
+        selector.current_index = names.index("dir1")
+        selector.process_key(ord(' '))
+        selector.draw_tree()
+        self.mock_stdscr.addstr.assert_any_call(0, 0, "Selected Files: 1/4", curses.A_BOLD)
+
+        # 파일 하나나 현재 폴더의 파일만 바뀌면 전체 트리를 다시 세지 않고 차이만 반영
+        with patch('selector_ui.count_selected_files', wraps=count_selected_files) as mock_count:
+            selector.current_index = names.index("file1.txt")
+            selector.process_key(ord(' '))
+            selector.current_index = names.index("dir1")
+            selector.process_key(ord('t'))
+            selector.draw_tree()
+            mock_count.assert_not_called()
+        self.assertEqual(selector._selected_count, count_selected_files(self.root_node))
+
+        # 파일이 없는 디렉토리에서 T를 눌러도 디렉토리 자신은 선택 수에 포함되지 않음
+        for name in ("empty", "empty", "outer", "outer"):
+            selector.current_index = names.index(name)
+            selector.process_key(ord('t'))
+            self.assertEqual(selector._selected_count, count_selected_files(self.root_node), name)
+
+    @patch('curses.doupdate')
+    @patch('curses.color_pair')
+    @patch('curses.init_pair')
+    @patch('curses.start_color')
+    @patch('curses.use_default_colors')
+    @patch('curses.curs_set')
+    def test_draw_tree_caches_visible_file_count(self, mock_curs_set, mock_use_default_colors, mock_start_color, mock_init_pair, mock_color_pair, mock_doupdate):
+        """검색 중 보이는 파일 수를 목록이 바뀐 뒤 한 번만 다시 세는지 테스트합니다."""
+        mock_color_pair.return_value = 0
+        selector = FileSelector(self.root_node, self.mock_stdscr)
+
+        selector.search_input_str = "file"
+        selector.visible_nodes = [row for row in selector.visible_nodes if not row[0].is_dir]
+        selector.draw_tree()
+        self.assertEqual(selector._visible_count, len(selector.visible_nodes))
+        selector.visible_nodes = selector.visible_nodes[:1]
+        self.assertIsNone(selector._visible_count)
+        selector.draw_tree()
+        self.assertEqual(selector._visible_count, 1)
+
+    @patch('curses.doupdate')
+    @patch('curses.color_pair')
+    @patch('curses.init_pair')
+    @patch('curses.start_color')
+    @patch('curses.use_default_colors')
+    @patch('curses.curs_set')
+    def test_draw_tree_truncates_long_names(self, mock_curs_set, mock_use_default_colors, mock_start_color, mock_init_pair, mock_color_pair, mock_doupdate):
+        """화면 폭보다 긴 이름이 "..."를 포함해 폭 안에 들어가도록 잘리는지 테스트합니다."""
+        mock_color_pair.return_value = 0
+        long_name = "a_very_long_file_name_for_testing.py"
+        self.root_node.children[long_name] = Node(long_name, False, self.root_node)
+        self.mock_stdscr.getmaxyx.return_value = (24, 20)
+        selector = FileSelector(self.root_node, self.mock_stdscr)
+
+        selector.draw_tree()
+        row = [node for node, _ in selector.visible_nodes].index(self.root_node.children[long_name])
+        # 폭 20 - 접두사 2 - 여백 1 = 17칸
+        self.mock_stdscr.addstr.assert_any_call(row + 2, 0, "✓ " + long_name[:14] + "...", 0)
+
     @patch('curses.color_pair')
     @patch('curses.init_pair')
     @patch('curses.start_color')
@@ -197,6 +380,124 @@ class TestFileSelector(unittest.TestCase):
         self.mock_stdscr.addstr.assert_called_with(0, selector.width - 25, "검색 결과 없음", mock_color_pair.return_value)
         self.mock_stdscr.refresh.assert_called_once()
 
+    @patch('curses.color_pair')
+    @patch('curses.init_pair')
+    @patch('curses.start_color')
+    @patch('curses.use_default_colors')
+    @patch('curses.curs_set')
+    def test_apply_search_filter_reuses_cached_result(self, mock_curs_set, mock_use_default_colors, mock_start_color, mock_init_pair, mock_color_pair):
+        """같은 검색어를 다시 적용하면 트리가 바뀌기 전까지 이전 검색 결과를 재사용하는지 테스트합니다."""
+        selector = FileSelector(self.root_node, self.mock_stdscr)
+        dir1 = self.root_node.children["dir1"]
+        file2 = dir1.children["file2.py"]
+
+        with patch('selector_ui.apply_search_filter', wraps=selector_actions.apply_search_filter) as mock_filter:
+            selector.search_input_str = "py"
+            selector.search_patterns_list = ["py"]
+            selector.apply_search_filter()
+            self.assertEqual(selector.visible_nodes, [(dir1, 0), (file2, 1)])
+
+            # 검색어를 바꿨다가 되돌리면 캐시된 결과 사용
+            selector.search_patterns_list = ["md"]
+            selector.apply_search_filter()
+            selector.search_patterns_list = ["py"]
+            selector.apply_search_filter()
+            self.assertEqual(mock_filter.call_count, 2)
+            self.assertEqual(selector.visible_nodes, [(dir1, 0), (file2, 1)])
+            # 결과 목록을 바꿔도 캐시는 영향받지 않음
+            selector.visible_nodes.clear()
+            selector.apply_search_filter()
+            self.assertEqual(selector.visible_nodes, [(dir1, 0), (file2, 1)])
+            self.assertEqual(mock_filter.call_count, 2)
+
+            # 대소문자 설정이 바뀌거나 트리가 바뀌면 다시 검색
+            selector.case_sensitive = True
+            selector.apply_search_filter()
+            self.assertEqual(mock_filter.call_count, 3)
+            selector.case_sensitive = False
+            selector.expand_all(False)
+            selector.apply_search_filter()
+            self.assertEqual(mock_filter.call_count, 4)
+            self.assertTrue(selector.search_had_no_results)
+
+            # 이전 검색어를 좁힌 검색은 이전 결과 안에서만 검색
+            selector.expand_all(True)
+            selector.search_patterns_list = ["2", "3"]
+            selector.apply_search_filter()
+            previous_rows = tuple(selector.visible_nodes)
+            selector.search_patterns_list = ["file2"]
+            selector.apply_search_filter()
+            self.assertEqual(mock_filter.call_args[0][5], previous_rows)
+            self.assertEqual(selector.visible_nodes, [(dir1, 0), (file2, 1)])
+
+    @patch('curses.color_pair')
+    @patch('curses.init_pair')
+    @patch('curses.start_color')
+    @patch('curses.use_default_colors')
+    @patch('curses.curs_set')
+    def test_search_cache_evicts_least_recently_used(self, mock_curs_set, mock_use_default_colors, mock_start_color, mock_init_pair, mock_color_pair):
+        """검색 결과 캐시가 가득 차면 가장 오래 쓰지 않은 결과부터 버리는지 테스트합니다."""
+        selector = FileSelector(self.root_node, self.mock_stdscr)
+        selector.search_input_str = "file"
+
+        def search(*patterns):
+            selector.search_patterns_list = list(patterns)
+            selector.apply_search_filter()
+
+        for i in range(selector_ui._SEARCH_CACHE_SIZE):
+            search(f"q{i}")
+        # 가장 먼저 넣은 결과를 다시 쓰면 최근 사용으로 옮겨져 남음
+        search("q0")
+        search("file")
+        self.assertEqual(len(selector._search_cache), selector_ui._SEARCH_CACHE_SIZE)
+        self.assertIn((("q0",), False), selector._search_cache)
+        self.assertNotIn((("q1",), False), selector._search_cache)
+
+    @patch('curses.color_pair')
+    @patch('curses.init_pair')
+    @patch('curses.start_color')
+    @patch('curses.use_default_colors')
+    @patch('curses.curs_set')
+    def test_run_skips_redraw_when_cursor_does_not_move(self, mock_curs_set, mock_use_default_colors, mock_start_color, mock_init_pair, mock_color_pair):
+        """맨 위에서 위로 이동하는 등 커서가 움직이지 않으면 다시 그리지 않는지 테스트합니다."""
+        selector = FileSelector(self.root_node, self.mock_stdscr)
+        self.mock_stdscr.getch.side_effect = [ord('k'), curses.KEY_UP, ord('j'), ord(' '), ord('x')]
+
+        with patch.object(selector, 'has_pending_input', return_value=False), \
+             patch.object(selector, 'draw_tree') as mock_draw_tree:
+            self.assertFalse(selector.run())
+
+        # 처음 한 번, 'j' 이동 후 한 번, 선택 전환 후 한 번
+        self.assertEqual(mock_draw_tree.call_count, 3)
+        self.assertEqual(selector.current_index, 1)
+
+    @patch('curses.doupdate')
+    @patch('curses.napms')
+    @patch('curses.color_pair')
+    @patch('curses.init_pair')
+    @patch('curses.start_color')
+    @patch('curses.use_default_colors')
+    @patch('curses.curs_set')
+    def test_search_error_banner_does_not_block(self, mock_curs_set, mock_use_default_colors, mock_start_color, mock_init_pair, mock_color_pair, mock_napms, mock_doupdate):
+        """잘못된 정규식 오류를 잠시 멈추지 않고 만료 시각까지 배너로 표시하는지 테스트합니다."""
+        mock_color_pair.return_value = 0
+        selector = FileSelector(self.root_node, self.mock_stdscr)
+        selector.search_input_str = "file[0-"
+        selector.search_patterns_list = ["file[0-"]
+
+        with patch('selector_ui.time.monotonic', return_value=100.0):
+            selector.apply_search_filter()
+            mock_napms.assert_not_called()
+            selector.draw_tree()
+        self.mock_stdscr.addstr.assert_any_call(22, 1, "Error: 잘못된 정규식", 0)
+
+        # 만료된 뒤 그리면 배너를 지움
+        self.mock_stdscr.addstr.reset_mock()
+        with patch('selector_ui.time.monotonic', return_value=100.0 + selector_ui._ERROR_BANNER_SECONDS):
+            selector.draw_tree()
+        self.assertIsNone(selector._error_message)
+        self.assertNotIn("Error: 잘못된 정규식", [c.args[2] for c in self.mock_stdscr.addstr.call_args_list])
+
     @patch('curses.color_pair')
     @patch('curses.init_pair')
     @patch('curses.start_color')
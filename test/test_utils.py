@@ -113,5 +113,21 @@ ignored_file.txt
             os.makedirs(non_gitignore_dir)
             self.assertEqual(load_gitignore_patterns(non_gitignore_dir), [])
 
+    def test_load_gitignore_patterns_reloads_on_change(self):
+        """.gitignore 파일이 변경되면 캐시된 패턴 대신 새 패턴을 로드하는지 테스트합니다."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            gitignore_path = os.path.join(temp_dir, ".gitignore")
+            with open(gitignore_path, "w") as f:
+                f.write("*.log\n")
+            self.assertEqual(load_gitignore_patterns(temp_dir), ["*.log"])
+
+            # 반환된 목록을 수정해도 캐시에 영향을 주지 않아야 함
+            load_gitignore_patterns(temp_dir).append("extra")
+            self.assertEqual(load_gitignore_patterns(temp_dir), ["*.log"])
+
+            with open(gitignore_path, "w") as f:
+                f.write("*.log\nbuild/\n")
+            self.assertEqual(load_gitignore_patterns(temp_dir), ["*.log", "build/"])
+
 if __name__ == '__main__':
     unittest.main()
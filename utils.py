@@ -9,9 +9,36 @@ CodeSelect 프로젝트의 공통 유틸리티 함수들을 포함하는 모듈
 import os
 import sys
 import fnmatch
+import functools
 import subprocess
-import tempfile
-from pathlib import Path
+
+# 확장자별 언어 이름 (get_language_name 호출마다 새로 만들지 않도록 모듈 상수로 정의)
+LANGUAGE_MAP = {
+    'py': 'Python',
+    'c': 'C',
+    'cpp': 'C++',
+    'h': 'C/C++ Header',
+    'hpp': 'C++ Header',
+    'js': 'JavaScript',
+    'ts': 'TypeScript',
+    'java': 'Java',
+    'html': 'HTML',
+    'css': 'CSS',
+    'php': 'PHP',
+    'rb': 'Ruby',
+    'go': 'Go',
+    'rs': 'Rust',
+    'swift': 'Swift',
+    'kt': 'Kotlin',
+    'sh': 'Shell',
+    'md': 'Markdown',
+    'json': 'JSON',
+    'xml': 'XML',
+    'yaml': 'YAML',
+    'yml': 'YAML',
+    'sql': 'SQL',
+    'r': 'R',
+}
 
 def get_language_name(extension):
     """
@@ -23,33 +50,7 @@ def get_language_name(extension):
     Returns:
         str: 확장자에 해당하는 언어 이름
     """
-    language_map = {
-        'py': 'Python',
-        'c': 'C',
-        'cpp': 'C++',
-        'h': 'C/C++ Header',
-        'hpp': 'C++ Header',
-        'js': 'JavaScript',
-        'ts': 'TypeScript',
-        'java': 'Java',
-        'html': 'HTML',
-        'css': 'CSS',
-        'php': 'PHP',
-        'rb': 'Ruby',
-        'go': 'Go',
-        'rs': 'Rust',
-        'swift': 'Swift',
-        'kt': 'Kotlin',
-        'sh': 'Shell',
-        'md': 'Markdown',
-        'json': 'JSON',
-        'xml': 'XML',
-        'yaml': 'YAML',
-        'yml': 'YAML',
-        'sql': 'SQL',
-        'r': 'R',
-    }
-    return language_map.get(extension, extension.upper())
+    return LANGUAGE_MAP.get(extension, extension.upper())
 
 def try_copy_to_clipboard(text):
     """
@@ -125,6 +126,9 @@ def load_gitignore_patterns(directory):
     """
     Reads `.gitignore` file and returns a list of valid ignore patterns.
 
+    Parsed results are cached per file and reused until the file's
+    modification time or size changes.
+
     Args:
         directory (str): The directory containing the .gitignore file.
 
@@ -134,7 +138,23 @@ def load_gitignore_patterns(directory):
     gitignore_path = os.path.join(directory, ".gitignore")
     if not os.path.isfile(gitignore_path):
         return []
-    
+
+    stat = os.stat(gitignore_path)
+    return list(_read_gitignore_patterns(gitignore_path, stat.st_mtime_ns, stat.st_size))
+
+@functools.lru_cache(maxsize=64)
+def _read_gitignore_patterns(gitignore_path, mtime_ns, size):
+    """
+    Parses a `.gitignore` file. Cached on (path, mtime, size).
+
+    Args:
+        gitignore_path (str): Path to the .gitignore file.
+        mtime_ns (int): Modification time of the file, used as cache key.
+        size (int): Size of the file, used as cache key.
+
+    Returns:
+        tuple: Ignore patterns from the .gitignore file.
+    """
     patterns = []
     with open(gitignore_path, "r", encoding="utf-8") as f:
         for line in f:
@@ -142,8 +162,8 @@ def load_gitignore_patterns(directory):
             # Skip empty lines and comments
             if line and not line.startswith("#"):
                 patterns.append(line)
-    
-    return patterns
+
+    return tuple(patterns)
 
 def should_ignore_path(path, ignore_patterns=None):
     """